@@ -30,6 +30,9 @@ if ! docker ps --format '{{.Names}}' | grep -q "^${DB_CONTAINER}$"; then
 fi
 echo "✅ DB container is running."
 
+echo "==> Applying schema (create_tables)"
+poetry run python -m scripts.create_tables
+
 echo "==> [1/3] Fetching main categories (categories.yaml)"
 poetry run python -m scripts.fetch_categories
 
@@ -19,5 +19,8 @@ if ! command -v poetry >/dev/null 2>&1; then
   exit 1
 fi
 
+echo "[INFO] Applying schema (create_tables)"
+poetry run python -m scripts.create_tables
+
 echo "[INFO] Starting API: http://127.0.0.1:8000"
 exec poetry run uvicorn src.tuik_pipeline.main:app --reload --host 0.0.0.0 --port 8000
@@ -13,22 +13,35 @@ else
 fi
 
 if [ $# -lt 1 ]; then
-  echo "Usage: ./run_config.sh <keyword> [extra_args]"
+  echo "Usage: ./run_config.sh <keyword> [--resume RUN_ID] [extra_args]"
   exit 1
 fi
 
 KW="$1"
 shift || true
 
-echo "[STEP 1] DOWNLOAD + manifest: $KW"
+RESUME_ID=""
+if [ "${1:-}" = "--resume" ]; then
+  RESUME_ID="${2:?--resume requires a run id}"
+  shift 2
+fi
 
-# Ensure clean slate: remove old manifest for this keyword if exists
 MANIFEST_PATH="downloads/${KW}/manifest.csv"
-if [ -f "$MANIFEST_PATH" ]; then
-    rm "$MANIFEST_PATH"
-fi
+RUN_ID_PATH="downloads/${KW}/run_id"
 
-poetry run python -m scripts.print_from_config "$KW" "$@"
+if [ -n "$RESUME_ID" ]; then
+  echo "[STEP 1] RESUME run $RESUME_ID: DOWNLOAD + manifest: $KW"
+  poetry run python -m scripts.print_from_config "$KW" --resume "$RESUME_ID" "$@"
+else
+  echo "[STEP 1] DOWNLOAD + manifest: $KW"
+
+  # Ensure clean slate: remove old manifest for this keyword if exists
+  if [ -f "$MANIFEST_PATH" ]; then
+      rm "$MANIFEST_PATH"
+  fi
+
+  poetry run python -m scripts.print_from_config "$KW" "$@"
+fi
 
 # Check if manifest exists
 if [ ! -f "$MANIFEST_PATH" ]; then
@@ -38,10 +51,18 @@ if [ ! -f "$MANIFEST_PATH" ]; then
   exit 0
 fi
 
-echo "[STEP 2] NORMALIZE from manifest: $MANIFEST_PATH"
-poetry run python -m scripts.normalize_from_manifest "$MANIFEST_PATH"
+RUN_ID="$(cat "$RUN_ID_PATH")"
+echo "[INFO] Pipeline run id: $RUN_ID (if interrupted: ./run_config.sh \"$KW\" --resume $RUN_ID)"
+if [ -n "$RESUME_ID" ]; then
+  RUN_ARGS=(--resume "$RUN_ID")
+else
+  RUN_ARGS=(--run-id "$RUN_ID")
+fi
+
+echo "[STEP 2] NORMALIZE from manifest: $MANIFEST_PATH (run $RUN_ID)"
+poetry run python -m scripts.normalize_from_manifest "$MANIFEST_PATH" "${RUN_ARGS[@]}"
 
-echo "[STEP 3] LOAD to DB: normalized/$KW"
-poetry run python -m scripts.load_observations "normalized/$KW"
+echo "[STEP 3] LOAD to DB: normalized/$KW (run $RUN_ID)"
+poetry run python -m scripts.load_observations "normalized/$KW" "${RUN_ARGS[@]}"
 
-echo "[DONE] Pipeline finished for: $KW"
+echo "[DONE] Pipeline finished for: $KW (run $RUN_ID)"
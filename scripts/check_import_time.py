@@ -0,0 +1,69 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# Lines of `python -X importtime`: "import time: <self us> | <cumulative us> | <indented module>"
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+def measure(module: str, forbid: list[str]) -> tuple[int, list[tuple[int, str]], list[str]]:
+    """
+    Imports `module` in a fresh interpreter. Returns its cumulative import time (us),
+    the (cumulative us, name) of top-level imports it triggered, and which forbidden
+    modules ended up loaded.
+    """
+    code = f"import sys, {module}; print(','.join(m for m in {forbid!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    # Children are printed before their parent, one indent level deeper
+    total = 0
+    children = []
+    pending = []
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent == 1:
+            if name == module:
+                total, children = cumulative, pending
+            pending = []
+        elif indent == 3:
+            pending.append((cumulative, name))
+
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return total, sorted(children, reverse=True), loaded
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the API import time against a budget")
+    parser.add_argument("--module", default="src.tuik_pipeline.main")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Max import time of --module")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to measure (best run counts)")
+    parser.add_argument("--forbid", nargs="*", default=["pandas", "requests", "pyarrow"],
+                        help="Modules that must not be imported at startup")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    results = [measure(args.module, args.forbid) for _ in range(max(1, args.runs))]
+    total, children, loaded = min(results, key=lambda r: r[0])
+    total_ms = total / 1000
+
+    print(f"{args.module}: {total_ms:.1f} ms (best of {len(results)}, budget {args.budget_ms:.0f} ms)")
+    for us, name in children[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        print(f"[FAIL] Heavy modules imported at startup: {', '.join(loaded)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"[FAIL] Import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("[OK] Within budget")
+    sys.exit(1 if failed else 0)
@@ -1,9 +1,10 @@
 from src.tuik_pipeline.core.database import Base, engine
-# Import models to register them
-from src.tuik_pipeline.models import Category, Dataset, Observation
+from src.tuik_pipeline.core.partitions import partitioning
+# Import models to register them (the package imports every model and the view DDL)
+from src.tuik_pipeline import models  # noqa: F401
 
 def main():
-    print("[INFO] Creating tables...")
+    print(f"[INFO] Creating tables (observations partitioning={partitioning()})...")
     Base.metadata.create_all(bind=engine)
     print("[OK] Tables created successfully.")
 
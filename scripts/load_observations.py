@@ -1,6 +1,7 @@
 import argparse
-from src.tuik_pipeline.etl.loader import run_loader_pipeline
+from src.tuik_pipeline.etl.loader import run_loader_pipeline, DEFAULT_CHUNKSIZE
 from src.tuik_pipeline.core.logging import setup_logging
+from src.tuik_pipeline.core.profiling import profile_stage
 
 if __name__ == "__main__":
     setup_logging()
@@ -8,6 +9,23 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("root")
     parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--replace", action="store_true", help="Replace existing rows of each loaded dataset")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk (0 = whole file)")
+    parser.add_argument("--workers", type=int, default=1, help="Datasets loaded concurrently")
+    parser.add_argument("--force", action="store_true", help="Ignore the artifact ledger and reload everything")
+    parser.add_argument("--run-id", type=int, default=None, help="Record item states on this pipeline run")
+    parser.add_argument("--resume", type=int, default=None, metavar="RUN_ID", help="Resume a pipeline run, skipping completed items")
+    parser.add_argument("--profile", action="store_true", help="CPU/memory profile and slowest-files table (profiles/)")
     args = parser.parse_args()
 
-    run_loader_pipeline(args.root, args.limit)
+    with profile_stage("load", enabled=args.profile):
+        run_loader_pipeline(
+            args.root,
+            args.limit,
+            replace=args.replace,
+            chunksize=args.chunksize,
+            workers=args.workers,
+            force=args.force,
+            run_id=args.resume or args.run_id,
+            resume=args.resume is not None
+        )
@@ -0,0 +1,345 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import httpx
+from sqlalchemy import delete, select, text
+
+from src.tuik_pipeline.core.arrow_store import publish_datasets, unpublish_dataset
+from src.tuik_pipeline.core.database import SessionLocal, engine
+from src.tuik_pipeline.core.logging import setup_logging, get_logger
+from src.tuik_pipeline.core.partitions import dataset_partition_name, ensure_partitions, partitioning
+from src.tuik_pipeline.etl.dimensions import DimensionCache
+from src.tuik_pipeline.etl.rollups import refresh_rollups
+from src.tuik_pipeline.models.dataset import Dataset
+
+logger = get_logger("load_test")
+
+# Seeded catalogue rows live under this fake parent id, so re-seeding and --cleanup
+# only ever touch load-test data (observations and rollups go with them via ON DELETE CASCADE).
+LOADTEST_UST_ID = 999999
+LOADTEST_METRIC_PREFIX = "loadtest_m"
+
+ENDPOINTS = {
+    "list": lambda ids: "/datasets",
+    "detail": lambda ids: f"/datasets/{random.choice(ids)}",
+    "table": lambda ids: f"/datasets/{random.choice(ids)}/table",
+    "table_columns": lambda ids: f"/datasets/{random.choice(ids)}/table?format=columns",
+    "observations": lambda ids: f"/datasets/{random.choice(ids)}/observations?limit=500",
+    "summary": lambda ids: f"/datasets/{random.choice(ids)}/summary",
+}
+
+# --- Seeding ---
+
+def seed_catalogue(datasets: int, obs_per_dataset: int, metrics: int, stub_url: str) -> list[int]:
+    """
+    Replaces the load-test catalogue with `datasets` rows whose download_url points at the
+    stub upstream, each with `obs_per_dataset` observations spread over `metrics` metrics.
+    """
+    remove_loadtest_data()
+    with SessionLocal() as db:
+        db.add_all([
+            Dataset(
+                ust_id=LOADTEST_UST_ID,
+                group_name="loadtest",
+                title=f"Load test dataset {i:05d}",
+                publish_date_raw="2024",
+                download_path=f"/loadtest/{i}",
+                download_url=f"{stub_url}/loadtest/{i}.xlsx",
+                is_archived=False,
+            )
+            for i in range(datasets)
+        ])
+        db.commit()
+        ids = db.scalars(select(Dataset.id).where(Dataset.ust_id == LOADTEST_UST_ID).order_by(Dataset.id)).all()
+
+    if obs_per_dataset > 0:
+        names = [f"{LOADTEST_METRIC_PREFIX}{i}" for i in range(max(1, metrics))]
+        metric_ids = DimensionCache().metric_ids(names)
+        metric_ids = [metric_ids[n] for n in names]
+        with engine.begin() as conn:
+            ensure_partitions(conn, dataset_ids=ids)
+        with engine.begin() as conn:
+            for ds_id in ids:
+                conn.execute(
+                    text(
+                        "INSERT INTO observation_facts (dataset_id, year, metric_id, value) "
+                        "SELECT :ds, 1990 + (g % 30), (CAST(:metric_ids AS integer[]))[1 + g % :k], "
+                        "round((random() * 1000)::numeric, 3) "
+                        "FROM generate_series(0, :n - 1) AS g"
+                    ),
+                    {"ds": ds_id, "metric_ids": metric_ids, "k": len(metric_ids), "n": obs_per_dataset},
+                )
+        with SessionLocal() as db:
+            refresh_rollups(db, ids)
+        publish_datasets(ids)
+
+    logger.info(f"Seeded {len(ids)} datasets x {obs_per_dataset} observations")
+    return list(ids)
+
+def remove_loadtest_data() -> int:
+    """
+    Deletes the load-test catalogue and everything seeding created for it: observations and
+    rollups (by cascade), list partitions, the published Arrow files and the seeded metrics.
+    Returns the number of datasets removed.
+    """
+    with SessionLocal() as db:
+        ids = list(db.scalars(select(Dataset.id).where(Dataset.ust_id == LOADTEST_UST_ID)).all())
+        db.execute(delete(Dataset).where(Dataset.ust_id == LOADTEST_UST_ID))
+        db.commit()
+
+    if ids and partitioning() == "list":
+        with engine.begin() as conn:
+            for ds_id in ids:
+                conn.execute(text(f"DROP TABLE IF EXISTS {dataset_partition_name(ds_id)}"))
+    for ds_id in ids:
+        unpublish_dataset(ds_id)
+
+    # Only metrics no real data has picked up since
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "DELETE FROM metrics m WHERE m.name LIKE :prefix "
+                "AND NOT EXISTS (SELECT 1 FROM observation_facts o WHERE o.metric_id = m.id) "
+                "AND NOT EXISTS (SELECT 1 FROM rollup_metric_yearly r WHERE r.metric_id = m.id) "
+                "AND NOT EXISTS (SELECT 1 FROM rollup_education_stats r WHERE r.metric_id = m.id)"
+            ),
+            {"prefix": LOADTEST_METRIC_PREFIX + "%"},
+        )
+    return len(ids)
+
+def cleanup() -> None:
+    n = remove_loadtest_data()
+    logger.info(f"Removed {n} load-test datasets")
+
+# --- Stub upstream ---
+
+def build_workbook(rows: int, cols: int) -> bytes:
+    """
+    An .xlsx shaped like a TUIK table: three title rows, then a header row and the data.
+    """
+    import pandas as pd
+
+    rng = random.Random(0)
+    df = pd.DataFrame(
+        {f"col{c}": [round(rng.random() * 1000, 2) for _ in range(rows)] for c in range(cols)}
+    )
+    df.insert(0, "Yıl", [1990 + i % 30 for i in range(rows)])
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, startrow=3)
+    return buf.getvalue()
+
+def start_stub_upstream(host: str, port: int, body: bytes, delay_ms: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if delay_ms:
+                time.sleep(delay_ms / 1000)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Stub upstream on http://{host}:{port} ({len(body)} byte workbook, delay={delay_ms}ms)")
+    return server
+
+# --- App under test ---
+
+def start_uvicorn(port: int, workers: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.tuik_pipeline.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 60s")
+
+def make_client(url: str | None, concurrency: int) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if url:
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=120)
+    # In-process: exercises the app and its DB pool without a server in between
+    from src.tuik_pipeline.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app", limits=limits, timeout=120)
+
+# --- Driver ---
+
+async def drive(
+    client: httpx.AsyncClient,
+    ids: list[int],
+    mix: dict[str, float],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> tuple[dict[str, list[float]], dict[str, dict[int, int]], float]:
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    latencies: dict[str, list[float]] = {n: [] for n in names}
+    statuses: dict[str, dict[int, int]] = {n: {} for n in names}
+
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    stop_at = measure_from + duration
+
+    async def user() -> None:
+        while (now := loop.time()) < stop_at:
+            name = random.choices(names, weights)[0]
+            path = ENDPOINTS[name](ids)
+            started = loop.time()
+            try:
+                status = (await client.get(path, headers={"Accept-Encoding": "gzip"})).status_code
+            except httpx.HTTPError:
+                status = 0
+            if started >= measure_from:
+                latencies[name].append(loop.time() - started)
+                statuses[name][status] = statuses[name].get(status, 0) + 1
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, statuses, duration
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    k = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+def summarize(latencies: dict[str, list[float]], statuses: dict[str, dict[int, int]], elapsed: float) -> list[dict]:
+    report = []
+    for name, values in list(latencies.items()) + [("ALL", [v for vs in latencies.values() for v in vs])]:
+        values = sorted(values)
+        codes = {}
+        for per in ([statuses[name]] if name != "ALL" else statuses.values()):
+            for code, n in per.items():
+                codes[code] = codes.get(code, 0) + n
+        report.append({
+            "endpoint": name,
+            "requests": len(values),
+            "errors": sum(n for code, n in codes.items() if code == 0 or code >= 500),
+            "rps": len(values) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p90_ms": percentile(values, 90) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": (values[-1] if values else float("nan")) * 1000,
+            "statuses": {str(k): v for k, v in sorted(codes.items())},
+        })
+    return report
+
+def print_report(report: list[dict]) -> None:
+    print(f"\n{'endpoint':<14} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}  statuses")
+    for r in report:
+        print(
+            f"{r['endpoint']:<14} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+            f"{r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}  {r['statuses']}"
+        )
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r} (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+if __name__ == "__main__":
+    setup_logging()
+    # One log line per request would dominate the measurement
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="Seed a local DB, stub the upstream Excel host and load-test the API")
+    parser.add_argument("--datasets", type=int, default=200, help="Catalogue size to seed")
+    parser.add_argument("--obs-per-dataset", type=int, default=2000, help="Observations per seeded dataset")
+    parser.add_argument("--metrics", type=int, default=20, help="Distinct metrics per dataset")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse the previously seeded catalogue")
+    parser.add_argument("--cleanup", action="store_true", help="Remove the load-test catalogue and exit")
+
+    parser.add_argument("--stub-port", type=int, default=8799)
+    parser.add_argument("--table-rows", type=int, default=500, help="Rows in the stubbed upstream workbook")
+    parser.add_argument("--table-cols", type=int, default=10)
+    parser.add_argument("--upstream-delay-ms", type=float, default=0.0, help="Simulated upstream latency")
+
+    parser.add_argument("--url", default=None, help="Test a running server instead of the in-process app")
+    parser.add_argument("--uvicorn-workers", type=int, default=0, help="Start uvicorn with N workers for the test")
+    parser.add_argument("--uvicorn-port", type=int, default=8010)
+
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent async clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before the measurement")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("list=1,detail=4,table=1"),
+                        help=f"Weighted endpoints, e.g. list=1,detail=4,table=1 ({', '.join(ENDPOINTS)})")
+    parser.add_argument("--rng-seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        sys.exit(0)
+
+    random.seed(args.rng_seed)
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+    start_stub_upstream("127.0.0.1", args.stub_port, build_workbook(args.table_rows, args.table_cols), args.upstream_delay_ms)
+
+    if args.no_seed:
+        with SessionLocal() as db:
+            ids = list(db.scalars(select(Dataset.id).where(Dataset.ust_id == LOADTEST_UST_ID)).all())
+        if not ids:
+            sys.exit("[ERROR] No seeded catalogue found; run without --no-seed first")
+    else:
+        ids = seed_catalogue(args.datasets, args.obs_per_dataset, args.metrics, stub_url)
+
+    server = None
+    url = args.url
+    if args.uvicorn_workers > 0 and not url:
+        server = start_uvicorn(args.uvicorn_port, args.uvicorn_workers)
+        url = f"http://127.0.0.1:{args.uvicorn_port}"
+
+    async def main() -> list[dict]:
+        async with make_client(url, args.concurrency) as client:
+            latencies, statuses, elapsed = await drive(
+                client, ids, args.mix, args.concurrency, args.duration, args.warmup
+            )
+        return summarize(latencies, statuses, elapsed)
+
+    try:
+        print(
+            f"[INFO] target={url or 'in-process'} concurrency={args.concurrency} duration={args.duration}s "
+            f"mix={args.mix} datasets={len(ids)}"
+        )
+        report = asyncio.run(main())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items()}, "report": report}, f, indent=2)
+        print(f"[OK] Report written to {args.json}")
@@ -0,0 +1,46 @@
+import argparse
+from src.tuik_pipeline.core.database import engine
+from src.tuik_pipeline.core.logging import setup_logging
+from src.tuik_pipeline.core.partitions import (
+    partitioning, list_partitions, ensure_partitions,
+    attach_dataset_partition, detach_dataset_partition, swap_dataset_partition,
+)
+
+if __name__ == "__main__":
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Manage observation_facts partitions")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("list")
+
+    p_ensure = sub.add_parser("ensure")
+    p_ensure.add_argument("--dataset", type=int, nargs="*", default=[])
+
+    p_detach = sub.add_parser("detach")
+    p_detach.add_argument("dataset_id", type=int)
+
+    p_attach = sub.add_parser("attach")
+    p_attach.add_argument("dataset_id", type=int)
+    p_attach.add_argument("table")
+
+    p_swap = sub.add_parser("swap")
+    p_swap.add_argument("dataset_id", type=int)
+    p_swap.add_argument("staging_table")
+
+    args = parser.parse_args()
+
+    print(f"[INFO] observations partitioning={partitioning()}")
+
+    with engine.begin() as conn:
+        if args.cmd == "list":
+            for name, bound in list_partitions(conn):
+                print(f"  {name}: {bound}")
+        elif args.cmd == "ensure":
+            ensure_partitions(conn, dataset_ids=args.dataset)
+        elif args.cmd == "detach":
+            print(f"[OK] Detached as {detach_dataset_partition(conn, args.dataset_id)}")
+        elif args.cmd == "attach":
+            attach_dataset_partition(conn, args.dataset_id, args.table)
+        elif args.cmd == "swap":
+            swap_dataset_partition(conn, args.dataset_id, args.staging_table)
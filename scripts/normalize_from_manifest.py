@@ -1,6 +1,7 @@
 import argparse
 from src.tuik_pipeline.etl.normalizer import run_normalization_pipeline
 from src.tuik_pipeline.core.logging import setup_logging
+from src.tuik_pipeline.core.profiling import profile_stage
 
 if __name__ == "__main__":
     setup_logging()
@@ -10,13 +11,23 @@ if __name__ == "__main__":
     ap.add_argument("--out", default="normalized")
     ap.add_argument("--header", nargs="+", default=["0", "1", "2"])
     ap.add_argument("--limit", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=4, help="Worker processes parsing and normalizing the sheets of a workbook")
+    ap.add_argument("--force", action="store_true", help="Ignore the artifact ledger and re-normalize everything")
+    ap.add_argument("--run-id", type=int, default=None, help="Record item states on this pipeline run")
+    ap.add_argument("--resume", type=int, default=None, metavar="RUN_ID", help="Resume a pipeline run, skipping completed items")
+    ap.add_argument("--profile", action="store_true", help="CPU/memory profile and slowest-workbooks table (profiles/)")
     args = ap.parse_args()
 
     header_rows = [int(x) for x in args.header]
 
-    run_normalization_pipeline(
-        manifest_path_str=args.manifest,
-        out_root_str=args.out,
-        header_rows=header_rows,
-        limit=args.limit
-    )
+    with profile_stage("normalize", enabled=args.profile):
+        run_normalization_pipeline(
+            manifest_path_str=args.manifest,
+            out_root_str=args.out,
+            header_rows=header_rows,
+            limit=args.limit,
+            workers=args.workers,
+            force=args.force,
+            run_id=args.resume or args.run_id,
+            resume=args.resume is not None
+        )
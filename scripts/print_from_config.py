@@ -2,6 +2,7 @@ import argparse
 import sys
 from src.tuik_pipeline.etl.downloader import run_downloader_pipeline
 from src.tuik_pipeline.core.logging import setup_logging
+from src.tuik_pipeline.core.profiling import profile_stage
 
 if __name__ == "__main__":
     setup_logging()
@@ -10,12 +11,16 @@ if __name__ == "__main__":
     parser.add_argument("keyword", nargs="?", help="Search keyword")
     parser.add_argument("--config", default="config/crawl.yaml")
     parser.add_argument("--no-download-prompt", action="store_true")
+    parser.add_argument("--resume", type=int, default=None, metavar="RUN_ID", help="Resume a pipeline run")
+    parser.add_argument("--profile", action="store_true", help="CPU/memory profile and slowest-downloads table (profiles/)")
     
     args = parser.parse_args()
 
     # If --no-download-prompt is passed, we skip prompt (True).
-    run_downloader_pipeline(
-        keyword_arg=args.keyword,
-        config_path=args.config,
-        skip_prompt=args.no_download_prompt
-    )
+    with profile_stage("download", enabled=args.profile):
+        run_downloader_pipeline(
+            keyword_arg=args.keyword,
+            config_path=args.config,
+            skip_prompt=args.no_download_prompt,
+            resume_run_id=args.resume
+        )
@@ -0,0 +1,23 @@
+import argparse
+from sqlalchemy import select
+from src.tuik_pipeline.core.arrow_store import enabled, publish_dataset, store_root
+from src.tuik_pipeline.core.database import SessionLocal
+from src.tuik_pipeline.core.logging import setup_logging
+from src.tuik_pipeline.models.observation import Observation
+
+if __name__ == "__main__":
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Publish datasets to the Arrow store served by the API")
+    parser.add_argument("dataset_ids", type=int, nargs="*", help="Datasets to publish (default: all loaded)")
+    args = parser.parse_args()
+
+    if not enabled():
+        raise SystemExit("[ERROR] Arrow store disabled (ARROW_STORE_ENABLED) or pyarrow not installed")
+
+    with SessionLocal() as db:
+        ids = args.dataset_ids or db.scalars(select(Observation.dataset_id).distinct()).all()
+
+    for ds_id in sorted(ids):
+        rows = publish_dataset(ds_id)
+        print(f"[OK] dataset {ds_id}: {rows} rows -> {store_root()}")
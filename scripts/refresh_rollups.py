@@ -0,0 +1,17 @@
+import argparse
+from sqlalchemy import select
+from src.tuik_pipeline.core.database import SessionLocal
+from src.tuik_pipeline.core.logging import setup_logging
+from src.tuik_pipeline.etl.rollups import refresh_rollups
+from src.tuik_pipeline.models.observation import Observation
+
+if __name__ == "__main__":
+    setup_logging()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dataset_ids", type=int, nargs="*", help="Datasets to refresh (default: all loaded)")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        ids = args.dataset_ids or db.scalars(select(Observation.dataset_id).distinct()).all()
+        refresh_rollups(db, ids)
@@ -0,0 +1,23 @@
+import argparse
+from src.tuik_pipeline.etl.jobs import enqueue, requeue_stale
+from src.tuik_pipeline.etl.worker import run_worker
+from src.tuik_pipeline.core.logging import setup_logging
+
+if __name__ == "__main__":
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Run queued keyword pipeline jobs")
+    parser.add_argument("--workers", type=int, default=2, help="Jobs executed concurrently")
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    parser.add_argument("--enqueue", nargs="+", metavar="KEYWORD", help="Queue keywords and exit")
+    parser.add_argument("--requeue-stale", type=int, default=None, metavar="MINUTES",
+                        help="Requeue running jobs without a heartbeat for MINUTES and exit")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        for job in enqueue(args.enqueue):
+            print(f"{job.id}\t{job.status}\t{job.keyword}")
+    elif args.requeue_stale is not None:
+        requeue_stale(args.requeue_stale)
+    else:
+        run_worker(workers=args.workers, once=args.once)
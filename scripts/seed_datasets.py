@@ -1,10 +1,19 @@
+import argparse
 from pathlib import Path
 from src.tuik_pipeline.etl.extractors import seed_datasets
 from src.tuik_pipeline.core.logging import setup_logging
+from src.tuik_pipeline.core.profiling import profile_stage
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 CATEGORIES_YAML = PROJECT_ROOT / "config" / "categories.yaml"
 
 if __name__ == "__main__":
     setup_logging()
-    seed_datasets(CATEGORIES_YAML)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-children", action="store_true", help="Skip the sub-category crawl (top categories only)")
+    parser.add_argument("--profile", action="store_true", help="CPU/memory profile and slowest-categories table (profiles/)")
+    args = parser.parse_args()
+
+    with profile_stage("seed", enabled=args.profile):
+        seed_datasets(CATEGORIES_YAML, crawl_children=not args.no_children)
@@ -0,0 +1,187 @@
+import hashlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; without it responses are gzip-compressed only
+    brotli = None
+
+def accepted_encodings(headers: Headers) -> set[str]:
+    """
+    Codings listed in Accept-Encoding, minus those explicitly refused with q=0.
+    """
+    codings = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        name, _, params = part.partition(";")
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                pass
+        if name.strip():
+            codings.add(name.strip().lower())
+    return codings
+
+def negotiated_coding(headers: Headers) -> str | None:
+    """
+    The coding CompressionMiddleware applies to a large enough response: "br", "gzip" or None.
+    """
+    codings = accepted_encodings(headers)
+    if brotli is not None and "br" in codings:
+        return "br"
+    if "gzip" in codings:
+        return "gzip"
+    return None
+
+class CompressionMiddleware:
+    """
+    Brotli when the client accepts it and the brotli package is installed, otherwise
+    gzip (via Starlette's GZip responder). Bodies under `minimum_size` go out as-is.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            coding = negotiated_coding(Headers(scope=scope))
+            if coding == "br":
+                await BrotliResponder(self.app, self.minimum_size, self.brotli_quality)(scope, receive, send)
+                return
+            if coding == "gzip":
+                await GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+class BrotliResponder:
+    """
+    Same message handling as Starlette's GZipResponder, with a brotli compressor.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressor = brotli.Compressor(quality=quality)
+        self.initial_message: Message = {}
+        self.started = False
+        self.content_encoding_set = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_brotli)
+
+    async def send_with_brotli(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.initial_message = message
+            self.content_encoding_set = "content-encoding" in Headers(raw=message["headers"])
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.content_encoding_set:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if len(body) < self.minimum_size and not more_body:
+                await self.send(self.initial_message)
+                await self.send(message)
+                self.content_encoding_set = True  # pass any trailing messages through
+                return
+
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = "br"
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+                message["body"] = self.compressor.process(body) + self.compressor.flush()
+            else:
+                message["body"] = self.compressor.process(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        chunk = self.compressor.process(body)
+        message["body"] = chunk + (self.compressor.flush() if more_body else self.compressor.finish())
+        await self.send(message)
+
+class ETagMiddleware:
+    """
+    Strong ETags on complete 200 responses to GET, answering a matching If-None-Match
+    with 304 and no body. Streaming bodies pass through.
+
+    Runs inside the compression middleware and hashes the uncompressed body (gzip output
+    embeds a timestamp). Each content coding is a different representation, so the tag
+    gets the coding the outer layer will apply ("<hash>-gzip", "<hash>-br") and the
+    response varies on Accept-Encoding. `minimum_size` must match the compression layer's.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        coding = negotiated_coding(request_headers)
+        start: Message = {}
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = message["status"] != 200 or "etag" in Headers(raw=message["headers"])
+                if passthrough:
+                    await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            digest = hashlib.sha256(body).hexdigest()[:32]
+            if coding is not None and len(body) >= self.minimum_size:
+                digest += "-" + coding
+            etag = f'"{digest}"'
+            headers = MutableHeaders(raw=start["headers"])
+            headers["ETag"] = etag
+            headers.add_vary_header("Accept-Encoding")
+
+            if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+                del headers["Content-Length"]
+                del headers["Content-Type"]
+                await send({**start, "status": 304})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from typing import TYPE_CHECKING, Any
+
+from src.tuik_pipeline.core import raw_store
+from src.tuik_pipeline.core.config import settings
+from src.tuik_pipeline.core.logging import get_logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = get_logger(__name__)
+
+# Workbook previews for GET /datasets/{id}/table. The raw workbook bytes are cached in
+# memory (decompressed), so paging through a table costs one parse of the requested
+# window per request instead of a download or decompression plus a full-sheet parse.
+# Legacy .xls (OLE2) workbooks cannot be read partially, since xlrd decodes a whole sheet
+# whatever the window. For those the first sheet alone is parsed (xlrd on_demand skips the
+# other sheets) and the parsed frame is cached next to the bytes, under the same budget,
+# so later pages are sliced from it.
+
+# TUIK sheets start with three title rows; the fourth row is the header
+HEADER_ROW = 3
+
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+class UnknownColumnsError(ValueError):
+    """
+    Requested columns that are not in the sheet's header.
+    """
+    def __init__(self, missing: list[str]):
+        super().__init__(f"Unknown columns: {', '.join(missing)}")
+        self.missing = missing
+
+class ByteCache:
+    """
+    LRU cache bounded by the total size of its entries: byte strings, or other objects
+    put with their size in bytes. Entries can carry an expiry time (monotonic seconds);
+    entries larger than the budget are not cached.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Any, int, float | None]] = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, _, expires = entry
+            if expires is not None and expires < time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: Any, ttl: float | None = None, size: int | None = None) -> None:
+        size = len(data) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (data, size, None if ttl is None else time.monotonic() + ttl)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def _pop(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+cache = ByteCache(settings.preview_cache_max_bytes)
+
+def workbook_bytes(dataset_id: int, download_url: str) -> tuple[bytes, str, str]:
+    """
+    The dataset's newest downloaded workbook, or the file at download_url when it has
+    not been downloaded. Returns the bytes, their source ("raw_store" or "remote") and
+    the cache key identifying this version.
+    """
+    local = raw_store.latest_version(dataset_id)
+    if local is not None:
+        # Stored files are content-addressed or rewritten in place, so path + mtime identifies a version
+        key = f"file:{local}:{local.stat().st_mtime_ns}"
+        data = cache.get(key)
+        if data is None:
+            data = raw_store.read_bytes(local)
+            cache.put(key, data)
+        return data, "raw_store", key
+
+    key = f"url:{download_url}"
+    data = cache.get(key)
+    if data is None:
+        # requests is imported on first use, keeping it out of API startup
+        import requests
+
+        r = requests.get(download_url, timeout=60)
+        r.raise_for_status()
+        data = r.content
+        cache.put(key, data, ttl=settings.preview_cache_ttl_seconds)
+    return data, "remote", key
+
+def is_xls(content: bytes) -> bool:
+    return content[:8] == OLE2_MAGIC
+
+def first_sheet(content: bytes, cache_key: str | None = None, ttl: float | None = None) -> "pd.DataFrame":
+    """
+    The whole first sheet of a workbook, parsed once per cache_key and cached with its
+    in-memory size. Only the first sheet is loaded (xlrd on_demand for .xls).
+    """
+    key = f"sheet:{cache_key}" if cache_key else None
+    df = cache.get(key) if key else None
+    if df is None:
+        import pandas as pd
+
+        engine_kwargs = {"on_demand": True} if is_xls(content) else {}
+        with pd.ExcelFile(BytesIO(content), engine_kwargs=engine_kwargs) as xls:
+            df = xls.parse(0, skiprows=HEADER_ROW)
+        if key:
+            cache.put(key, df, ttl=ttl, size=int(df.memory_usage(deep=True).sum()))
+    return df
+
+def read_window(
+    content: bytes,
+    offset: int = 0,
+    limit: int | None = None,
+    columns: list[str] | None = None,
+    cache_key: str | None = None,
+    ttl: float | None = None,
+) -> tuple["pd.DataFrame", bool]:
+    """
+    Data rows [offset, offset + limit) of the first sheet, optionally only the named
+    columns. For .xlsx rows before the window are skipped and parsing stops after it
+    (one extra row tells whether more follow); .xls windows are sliced from the cached
+    first_sheet. Returns the frame and that flag.
+    Raises UnknownColumnsError listing requested columns missing from the header.
+    """
+    if is_xls(content):
+        df = first_sheet(content, cache_key, ttl)
+        return cut_window(df.iloc[offset:], columns, limit)
+
+    import pandas as pd
+
+    kwargs = {}
+    if offset:
+        kwargs["skiprows"] = lambda i: i < HEADER_ROW or HEADER_ROW < i <= HEADER_ROW + offset
+    else:
+        kwargs["skiprows"] = HEADER_ROW
+    if limit is not None:
+        kwargs["nrows"] = limit + 1
+    if columns:
+        wanted = set(columns)
+        kwargs["usecols"] = lambda c: str(c) in wanted
+
+    df = pd.read_excel(BytesIO(content), **kwargs)
+    return cut_window(df, columns, limit)
+
+def cut_window(
+    df: "pd.DataFrame",
+    columns: list[str] | None,
+    limit: int | None,
+) -> tuple["pd.DataFrame", bool]:
+    """
+    Keeps the requested columns in their requested order and cuts a parsed window to
+    limit rows. Returns the frame and whether more rows followed.
+    """
+    if columns:
+        wanted = set(columns)
+        found = {str(c) for c in df.columns}
+        missing = [c for c in columns if c not in found]
+        if missing:
+            raise UnknownColumnsError(missing)
+        # Requested order
+        df = df[sorted((c for c in df.columns if str(c) in wanted), key=lambda c: columns.index(str(c)))]
+
+    has_more = limit is not None and len(df) > limit
+    if has_more:
+        df = df.iloc[:limit]
+    return df, has_more
+
+def dataset_window(
+    dataset_id: int,
+    download_url: str,
+    offset: int = 0,
+    limit: int | None = None,
+    columns: list[str] | None = None,
+) -> tuple["pd.DataFrame", bool, str]:
+    """
+    read_window over the dataset's workbook (see workbook_bytes). A cached .xls sheet
+    expires with the remote bytes it was parsed from. Returns the frame, the has-more
+    flag and the workbook's source.
+    """
+    content, source, key = workbook_bytes(dataset_id, download_url)
+    ttl = settings.preview_cache_ttl_seconds if source == "remote" else None
+    df, has_more = read_window(content, offset, limit, columns, cache_key=key, ttl=ttl)
+    return df, has_more, source
@@ -0,0 +1,55 @@
+import json
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    """
+    Fallback for values neither encoder handles natively (pandas Timestamps,
+    numpy scalars, Decimals from Numeric columns).
+    """
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        return obj.item()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when it is installed. Routes that return it
+    directly also skip FastAPI's jsonable_encoder pass.
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def rows_payload(columns: list[str], rows: list[list], orient: str = "records") -> dict:
+    """
+    records -> {"columns": [...], "rows": [{col: value}, ...]}
+    columns -> {"columns": [...], "data": [[value, ...], ...]}
+    """
+    if orient == "columns":
+        return {"columns": columns, "data": rows}
+    return {"columns": columns, "rows": [dict(zip(columns, row)) for row in rows]}
+
+def frame_payload(df, orient: str = "records") -> dict:
+    """
+    Serializable body for a DataFrame, built from one object-array pass instead of
+    df.to_dict(orient="records").
+    """
+    return rows_payload([str(c) for c in df.columns], df.to_numpy(dtype=object).tolist(), orient)
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+
+from src.tuik_pipeline.core.database import get_db
+from src.tuik_pipeline.models.category import Category
+from src.tuik_pipeline.schemas.category import CategoryOut
+
+router = APIRouter(prefix="/categories", tags=["categories"])
+
+@router.get("", response_model=list[CategoryOut])
+def list_categories(
+    parent_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Whole tree in path order (parents before their children), or one subtree.
+    """
+    stmt = select(Category).order_by(Category.path)
+    if parent_id is not None:
+        parent = db.get(Category, parent_id)
+        if not parent or not parent.path:
+            raise HTTPException(status_code=404, detail="Category not found")
+        stmt = stmt.where(Category.path.like(parent.path + "%"))
+
+    return db.scalars(stmt).all()
+
+@router.get("/{category_id}", response_model=CategoryOut)
+def get_category(
+    category_id: int,
+    db: Session = Depends(get_db),
+):
+    cat = db.get(Category, category_id)
+    if not cat:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return cat
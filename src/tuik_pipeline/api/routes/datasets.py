@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-import requests
-import pandas as pd
-from io import BytesIO
 
 from src.tuik_pipeline.core.database import get_db
 from src.tuik_pipeline.models.dataset import Dataset
+from src.tuik_pipeline.models.category import Category
 from src.tuik_pipeline.schemas.dataset import DatasetOut
 from src.tuik_pipeline.core.logging import get_logger
+from src.tuik_pipeline.api.responses import FastJSONResponse, frame_payload
+from src.tuik_pipeline.api.preview import UnknownColumnsError, dataset_window
 
 logger = get_logger(__name__)
 
@@ -17,11 +18,18 @@ router = APIRouter(prefix="/datasets", tags=["datasets"])
 @router.get("", response_model=list[DatasetOut])
 def list_datasets(
     parent_id: int | None = None,
+    category_id: int | None = None,
     db: Session = Depends(get_db),
 ):
     stmt = select(Dataset)
     if parent_id is not None:
         stmt = stmt.where(Dataset.ust_id == parent_id)
+    if category_id is not None:
+        # Whole subtree in one range scan on ix_datasets_category_path
+        cat = db.get(Category, category_id)
+        if not cat or not cat.path:
+            raise HTTPException(status_code=404, detail="Category not found")
+        stmt = stmt.where(Dataset.category_path.like(cat.path + "%"))
 
     return db.scalars(stmt).all()
 
@@ -35,30 +43,43 @@ def get_dataset(
         raise HTTPException(status_code=404, detail="Dataset not found")
     return ds
 
-def load_excel_preview(download_url: str) -> pd.DataFrame:
-    try:
-        r = requests.get(download_url, timeout=60)
-        r.raise_for_status()
-        return pd.read_excel(BytesIO(r.content), skiprows=3)
-    except Exception as e:
-        logger.error(f"Failed to load excel for preview: {e}")
-        raise HTTPException(status_code=502, detail="Failed to fetch or parse Excel file from remote.")
-
-@router.get("/{dataset_id}/table")
+@router.get("/{dataset_id}/table", response_class=FastJSONResponse)
 def get_dataset_table(
     dataset_id: int,
+    format: Literal["records", "columns"] = "records",
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=100_000),
+    columns: list[str] | None = Query(None),
     db: Session = Depends(get_db),
 ):
+    """
+    format=records -> {"columns", "rows": [{...}]}; format=columns -> {"columns", "data": [[...]]},
+    which is smaller and cheaper to encode for wide tables.
+
+    offset/limit select a window of sheet rows and columns=<header> (repeatable) a subset of
+    columns; only that window is parsed (.xls sheets are parsed once and cached). Without
+    limit the whole sheet is returned.
+    """
     ds = db.get(Dataset, dataset_id)
     if not ds:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    url = ds.download_url
-    df = load_excel_preview(url)
+    try:
+        df, has_more, source = dataset_window(dataset_id, ds.download_url, offset, limit, columns)
+    except UnknownColumnsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to load excel for preview: {e}")
+        raise HTTPException(status_code=502, detail="Failed to fetch or parse Excel file.")
     df = df.dropna(how="all").fillna("")
 
-    return {
-        "dataset_id": dataset_id,
-        "columns": list(df.columns),
-        "rows": df.to_dict(orient="records"),
-    }
+    return FastJSONResponse(
+        {
+            "dataset_id": dataset_id,
+            "offset": offset,
+            "limit": limit,
+            "has_more": has_more,
+            **frame_payload(df, format),
+        },
+        headers={"X-Data-Source": source},
+    )
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+
+from src.tuik_pipeline.core.config import settings
+from src.tuik_pipeline.core.database import get_db
+from src.tuik_pipeline.etl.jobs import enqueue
+from src.tuik_pipeline.models.job import Job
+from src.tuik_pipeline.schemas.job import JobIn, JobOut
+
+# Jobs are executed by `python -m scripts.run_worker`, not by the API process.
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+def require_admin(x_admin_token: str | None = Header(default=None)):
+    if x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@router.post("", response_model=list[JobOut], status_code=202, dependencies=[Depends(require_admin)])
+def enqueue_jobs(body: JobIn):
+    jobs = enqueue(body.keywords)
+    if not jobs:
+        raise HTTPException(status_code=422, detail="No keywords given")
+    return jobs
+
+@router.get("", response_model=list[JobOut])
+def list_jobs(
+    status: str | None = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    stmt = select(Job).order_by(Job.id.desc()).limit(min(limit, 500))
+    if status is not None:
+        stmt = stmt.where(Job.status == status)
+    return db.scalars(stmt).all()
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+):
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
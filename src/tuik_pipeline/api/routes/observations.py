@@ -0,0 +1,86 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+
+from src.tuik_pipeline.core.arrow_store import reader, COLUMNS
+from src.tuik_pipeline.core.database import get_db
+from src.tuik_pipeline.core.logging import get_logger
+from src.tuik_pipeline.api.responses import FastJSONResponse, rows_payload
+
+logger = get_logger(__name__)
+
+# Served from the memory-mapped Arrow store when the dataset is published there,
+# otherwise from the observations view. Both return rows in the same order.
+router = APIRouter(prefix="/datasets", tags=["observations"])
+
+def read_from_db(
+    db: Session,
+    dataset_id: int,
+    metric: str | None,
+    year_from: int | None,
+    year_to: int | None,
+    offset: int,
+    limit: int,
+) -> tuple[list[str], list[list], int]:
+    where = ["dataset_id = :ds"]
+    params = {"ds": dataset_id, "offset": offset, "limit": limit}
+    if metric is not None:
+        where.append("metric = :metric")
+        params["metric"] = metric
+    if year_from is not None:
+        where.append("year >= :year_from")
+        params["year_from"] = year_from
+    if year_to is not None:
+        where.append("year <= :year_to")
+        params["year_to"] = year_to
+    cond = " AND ".join(where)
+
+    total = db.execute(text(f"SELECT count(*) FROM observations WHERE {cond}"), params).scalar_one()
+    rows = db.execute(
+        text(
+            f"SELECT {', '.join(COLUMNS)} FROM observations WHERE {cond} "
+            "ORDER BY metric, year, threshold, education OFFSET :offset LIMIT :limit"
+        ),
+        params,
+    ).all()
+    return COLUMNS, [[r.year, r.metric, r.threshold, r.education, None if r.value is None else float(r.value)] for r in rows], total
+
+@router.get("/{dataset_id}/observations", response_class=FastJSONResponse)
+def get_observations(
+    dataset_id: int,
+    metric: str | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=100_000),
+    format: Literal["records", "columns"] = "records",
+    db: Session = Depends(get_db),
+):
+    source = "arrow"
+    try:
+        found = reader.read(dataset_id, metric, year_from, year_to, offset, limit)
+    except Exception as e:
+        logger.warning(f"Arrow store read failed for dataset {dataset_id}, using database: {e}")
+        found = None
+
+    if found is None:
+        source = "db"
+        found = read_from_db(db, dataset_id, metric, year_from, year_to, offset, limit)
+
+    columns, rows, total = found
+    if total == 0 and source == "db" and db.execute(
+        text("SELECT 1 FROM datasets WHERE id = :ds"), {"ds": dataset_id}
+    ).first() is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    return FastJSONResponse(
+        {
+            "dataset_id": dataset_id,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            **rows_payload(columns, rows, format),
+        },
+        headers={"X-Data-Source": source},
+    )
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+
+from src.tuik_pipeline.core.database import get_db
+from src.tuik_pipeline.models.metric import Metric
+from src.tuik_pipeline.models.dimension import Dimension
+from src.tuik_pipeline.models.rollup import DatasetLatestYear, MetricYearly, EducationStats
+from src.tuik_pipeline.schemas.rollup import DatasetSummaryOut, MetricYearOut, EducationStatsOut
+
+# Served from the rollup_* summary tables, refreshed after each load.
+router = APIRouter(prefix="/datasets", tags=["rollups"])
+
+@router.get("/{dataset_id}/summary", response_model=DatasetSummaryOut)
+def get_dataset_summary(
+    dataset_id: int,
+    db: Session = Depends(get_db),
+):
+    row = db.get(DatasetLatestYear, dataset_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="No observations loaded for dataset")
+    return row
+
+@router.get("/{dataset_id}/series", response_model=list[MetricYearOut])
+def get_metric_series(
+    dataset_id: int,
+    metric: str | None = None,
+    db: Session = Depends(get_db),
+):
+    stmt = (
+        select(
+            Metric.name.label("metric"), MetricYearly.year, MetricYearly.n,
+            MetricYearly.avg_value, MetricYearly.min_value, MetricYearly.max_value,
+        )
+        .join(Metric, Metric.id == MetricYearly.metric_id)
+        .where(MetricYearly.dataset_id == dataset_id)
+        .order_by(Metric.name, MetricYearly.year)
+    )
+    if metric is not None:
+        stmt = stmt.where(Metric.name == metric)
+
+    return [MetricYearOut(**r._mapping) for r in db.execute(stmt)]
+
+@router.get("/{dataset_id}/education-stats", response_model=list[EducationStatsOut])
+def get_education_stats(
+    dataset_id: int,
+    metric: str | None = None,
+    db: Session = Depends(get_db),
+):
+    stmt = (
+        select(
+            Metric.name.label("metric"), Dimension.value.label("education"), EducationStats.n,
+            EducationStats.avg_value, EducationStats.min_value, EducationStats.max_value,
+        )
+        .join(Metric, Metric.id == EducationStats.metric_id)
+        .outerjoin(Dimension, Dimension.id == EducationStats.education_id)
+        .where(EducationStats.dataset_id == dataset_id)
+        .order_by(Metric.name, Dimension.value)
+    )
+    if metric is not None:
+        stmt = stmt.where(Metric.name == metric)
+
+    return [EducationStatsOut(**r._mapping) for r in db.execute(stmt)]
@@ -0,0 +1,224 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+from sqlalchemy import text
+
+from src.tuik_pipeline.core.config import settings
+from src.tuik_pipeline.core.database import engine, advisory_lock
+from src.tuik_pipeline.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Read-only copy of each dataset's observations for the API, published after every load:
+#   <ARROW_STORE_DIR>/<dataset_id>.arrow  Arrow IPC file, uncompressed so readers can memory-map it
+#   <ARROW_STORE_DIR>/manifest.json      {dataset_id: {"file", "version", "rows", "metrics": {name: [offset, length]}}}
+# Rows are sorted by (metric, year, threshold, education), so a metric is one contiguous slice.
+# pyarrow is optional: without it nothing is published and the API reads from Postgres.
+
+MANIFEST_NAME = "manifest.json"
+COLUMNS = ["year", "metric", "threshold", "education", "value"]
+# Rows per record batch when publishing
+BATCH_ROWS = 50_000
+
+PUBLISH_SQL = text(
+    "SELECT year, metric, threshold, education, value FROM observations "
+    "WHERE dataset_id = :ds ORDER BY metric, year, threshold, education"
+)
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        return pyarrow
+    except ImportError:
+        return None
+
+def enabled() -> bool:
+    return settings.arrow_store_enabled and _pyarrow() is not None
+
+def store_root() -> Path:
+    return Path(settings.arrow_store_dir)
+
+def read_manifest(root: Path | None = None) -> dict[str, dict]:
+    path = (root or store_root()) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def _replace_file(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def _update_manifest(root: Path, dataset_id: int, entry: dict | None) -> None:
+    # Loader threads and job worker processes may publish at the same time
+    with advisory_lock(f"arrow_manifest:{root.resolve()}"):
+        manifest = read_manifest(root)
+        if entry is None:
+            manifest.pop(str(dataset_id), None)
+        else:
+            manifest[str(dataset_id)] = entry
+        _replace_file(root / MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False).encode("utf-8"))
+
+def publish_dataset(dataset_id: int, root: Path | None = None) -> int:
+    """
+    Writes the dataset's observations to <dataset_id>.arrow and records it in the manifest.
+    A dataset without rows is removed from the store. Returns the number of rows published.
+    """
+    pa = _pyarrow()
+    root = root or store_root()
+    root.mkdir(parents=True, exist_ok=True)
+
+    schema = pa.schema([
+        ("year", pa.int32()),
+        ("metric", pa.string()),
+        ("threshold", pa.string()),
+        ("education", pa.string()),
+        ("value", pa.float64()),
+    ])
+    path = root / f"{dataset_id}.arrow"
+    tmp = path.with_name(path.name + ".tmp")
+
+    # Rows come off a server-side cursor and go out one record batch per chunk, so
+    # memory stays bounded by BATCH_ROWS whatever the dataset's size
+    rows = 0
+    metrics: dict[str, list[int]] = {}
+    try:
+        with engine.connect() as conn, pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            result = conn.execution_options(stream_results=True).execute(PUBLISH_SQL, {"ds": dataset_id})
+            while chunk := result.fetchmany(BATCH_ROWS):
+                for n, row in enumerate(chunk, start=rows):
+                    if row.metric in metrics:
+                        metrics[row.metric][1] += 1
+                    else:
+                        metrics[row.metric] = [n, 1]
+                cols = list(zip(*chunk))
+                cols[4] = [None if v is None else float(v) for v in cols[4]]
+                writer.write_batch(pa.record_batch(cols, schema=schema))
+                rows += len(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    if rows == 0:
+        tmp.unlink(missing_ok=True)
+        unpublish_dataset(dataset_id, root)
+        logger.info(f"Arrow store: dataset {dataset_id} has no rows, removed")
+        return 0
+    os.replace(tmp, path)
+
+    _update_manifest(root, dataset_id, {
+        "file": path.name,
+        "version": time.time_ns(),
+        "rows": rows,
+        "metrics": metrics,
+    })
+    logger.info(f"Arrow store: published dataset {dataset_id} ({rows} rows) -> {path}")
+    return rows
+
+def unpublish_dataset(dataset_id: int, root: Path | None = None) -> None:
+    """
+    Removes the dataset's file and manifest entry, if it was published.
+    """
+    root = root or store_root()
+    if not root.is_dir():
+        return
+    _update_manifest(root, dataset_id, None)
+    (root / f"{dataset_id}.arrow").unlink(missing_ok=True)
+
+def publish_datasets(dataset_ids: Iterable[int]) -> None:
+    """
+    Publishes each dataset; a no-op when the store is disabled or pyarrow is missing.
+    """
+    ids = sorted(set(dataset_ids))
+    if not ids or not enabled():
+        return
+    for ds_id in ids:
+        try:
+            publish_dataset(ds_id)
+        except Exception as e:
+            logger.error(f"Arrow store: failed to publish dataset {ds_id}: {e}")
+
+class ArrowReader:
+    """
+    Serves dataset slices from memory-mapped Arrow files. Tables are mapped once per
+    published version; the manifest is re-read when its mtime changes.
+    """
+    def __init__(self, root: Path | None = None):
+        self.root = root
+        self._lock = threading.Lock()
+        self._manifest: tuple[float, dict] = (-1.0, {})
+        self._tables: dict[int, tuple[int, Any]] = {}
+
+    def manifest(self) -> dict[str, dict]:
+        path = (self.root or store_root()) / MANIFEST_NAME
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return {}
+        if mtime != self._manifest[0]:
+            self._manifest = (mtime, read_manifest(self.root))
+        return self._manifest[1]
+
+    def table(self, dataset_id: int):
+        """
+        The dataset's table plus its manifest entry, or None if it is not published.
+        """
+        entry = self.manifest().get(str(dataset_id))
+        if entry is None:
+            return None
+
+        cached = self._tables.get(dataset_id)
+        if cached and cached[0] == entry["version"]:
+            return cached[1], entry
+
+        pa = _pyarrow()
+        with self._lock:
+            path = (self.root or store_root()) / entry["file"]
+            with pa.memory_map(str(path), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            if table.num_rows != entry["rows"]:
+                raise ValueError(f"{path} has {table.num_rows} rows, manifest says {entry['rows']}")
+            self._tables[dataset_id] = (entry["version"], table)
+        return table, entry
+
+    def read(
+        self,
+        dataset_id: int,
+        metric: str | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        offset: int = 0,
+        limit: int = 1000,
+    ) -> tuple[list[str], list[list], int] | None:
+        """
+        (columns, rows, total matching rows), or None when the caller should use the database.
+        """
+        if not enabled():
+            return None
+        found = self.table(dataset_id)
+        if found is None:
+            return None
+        table, entry = found
+
+        if metric is not None:
+            start, length = entry["metrics"].get(metric, (0, 0))
+            table = table.slice(start, length)
+        if year_from is not None or year_to is not None:
+            import pyarrow.compute as pc
+            mask = None
+            if year_from is not None:
+                mask = pc.greater_equal(table["year"], year_from)
+            if year_to is not None:
+                upper = pc.less_equal(table["year"], year_to)
+                mask = upper if mask is None else pc.and_(mask, upper)
+            table = table.filter(mask)
+
+        page = table.slice(offset, limit)
+        rows = [list(r) for r in zip(*(c.to_pylist() for c in page.columns))]
+        return page.column_names, rows, table.num_rows
+
+reader = ArrowReader()
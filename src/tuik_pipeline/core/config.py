@@ -7,6 +7,45 @@ class Settings(BaseSettings):
     requests_rps: float = 1.0
     admin_token: str = "devtoken"
 
+    # Downloads: (connect, read) timeouts in seconds, retries resume via HTTP Range
+    download_connect_timeout: float = 10.0
+    download_read_timeout: float = 60.0
+    download_retries: int = 5
+
+    # Content-addressed raw store for downloads (see core/raw_store.py): zstd level
+    # (0 = uncompressed; needs the optional zstandard package) and versions kept per dataset
+    raw_store_enabled: bool = False
+    raw_store_zstd_level: int = 10
+    raw_store_keep_versions: int = 3
+
+    # Connection pool (each parallel loader worker holds one connection)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+
+    # Observation partitioning: none | list | hash (by dataset_id) | range (by year).
+    # Only applied when the observation_facts table is first created.
+    observations_partitioning: str = "none"
+    observations_hash_partitions: int = 16
+
+    # Arrow IPC copy of each loaded dataset, served by /datasets/{id}/observations
+    # (needs the optional pyarrow package; otherwise reads go to Postgres)
+    arrow_store_enabled: bool = True
+    arrow_store_dir: str = "arrow_store"
+
+    # GET /datasets/{id}/table keeps workbook bytes in an in-memory LRU of this size;
+    # workbooks fetched from TUIK (not downloaded yet) are refetched after the TTL
+    preview_cache_max_bytes: int = 128 * 1024 * 1024
+    preview_cache_ttl_seconds: float = 600.0
+
+    # API responses smaller than this are sent uncompressed
+    api_compress_min_bytes: int = 1024
+
+    # Job queue: idle poll interval, how often a worker refreshes its running jobs'
+    # heartbeat, and heartbeat age after which a job is treated as orphaned and requeued
+    worker_poll_seconds: float = 5.0
+    job_heartbeat_seconds: float = 30.0
+    job_stale_minutes: int = 5
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from typing import Generator
 
@@ -14,7 +15,12 @@ if not DB_URL:
 
 # logger.info(f"Connecting to database: {DB_URL}") # Security: Avoid printing credentials
 
-engine = create_engine(DB_URL, pool_pre_ping=True)
+engine = create_engine(
+    DB_URL,
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 class Base(DeclarativeBase):
@@ -29,3 +35,18 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+@contextmanager
+def advisory_lock(key: str):
+    """
+    Session-level Postgres advisory lock on `key`, held on its own pooled connection.
+    Serializes work on the same file across processes (e.g. concurrent job workers).
+    """
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(hashtext(:k))"), {"k": key})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:k))"), {"k": key})
+            conn.commit()
@@ -0,0 +1,151 @@
+from typing import Iterable
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from src.tuik_pipeline.core.config import settings
+from src.tuik_pipeline.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+FACT_TABLE = "observation_facts"
+
+PARTITION_CLAUSES = {
+    "list": "LIST (dataset_id)",
+    "hash": "HASH (dataset_id)",
+    "range": "RANGE (year)",
+}
+
+def partitioning() -> str:
+    mode = (settings.observations_partitioning or "none").strip().lower()
+    if mode not in ("none", *PARTITION_CLAUSES):
+        raise ValueError(f"Unknown observations_partitioning: {mode}")
+    return mode
+
+def partition_key() -> str | None:
+    """
+    Column the fact table is partitioned on (it must be part of the primary key).
+    """
+    return {"list": "dataset_id", "hash": "dataset_id", "range": "year"}.get(partitioning())
+
+def dataset_partition_name(dataset_id: int) -> str:
+    return f"{FACT_TABLE}_ds_{int(dataset_id)}"
+
+def decade_partition_name(decade: int) -> str:
+    return f"{FACT_TABLE}_y{int(decade)}s"
+
+# The loader only accepts 19xx/20xx years, so range partitions cover them statically
+RANGE_FIRST_DECADE = 1900
+RANGE_LAST_DECADE = 2090
+
+def create_static_partitions(conn: Connection) -> None:
+    """
+    Partitions that exist independently of the data: hash buckets, or one range
+    partition per decade plus a DEFAULT partition. List partitions are created on demand.
+    """
+    mode = partitioning()
+    if mode == "hash":
+        n = max(1, settings.observations_hash_partitions)
+        for i in range(n):
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {FACT_TABLE}_h{i} PARTITION OF {FACT_TABLE} "
+                f"FOR VALUES WITH (MODULUS {n}, REMAINDER {i})"
+            ))
+    elif mode == "range":
+        for decade in range(RANGE_FIRST_DECADE, RANGE_LAST_DECADE + 1, 10):
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {decade_partition_name(decade)} PARTITION OF {FACT_TABLE} "
+                f"FOR VALUES FROM ({decade}) TO ({decade + 10})"
+            ))
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {FACT_TABLE}_default PARTITION OF {FACT_TABLE} DEFAULT"
+        ))
+
+def ensure_partitions(conn: Connection, dataset_ids: Iterable[int] = ()) -> None:
+    """
+    Creates the per-dataset partitions needed under list partitioning.
+    No-op for the other modes, whose partitions are static.
+
+    Existing partitions are looked up in the catalog on every call rather than cached,
+    since other processes (manage_partitions, a long-running worker) may detach or
+    drop them. Creating a partition locks the parent table, so call this on its own
+    short transaction before the load transaction touches observation_facts.
+    """
+    if partitioning() != "list":
+        return
+    wanted = {dataset_partition_name(ds_id): int(ds_id) for ds_id in set(dataset_ids)}
+    if not wanted:
+        return
+    attached = set(conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            f"WHERE i.inhparent = '{FACT_TABLE}'::regclass AND c.relname = ANY(:names)"
+        ),
+        {"names": list(wanted)},
+    ).scalars())
+    for name, ds_id in sorted(wanted.items(), key=lambda kv: kv[1]):
+        if name in attached:
+            continue
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {FACT_TABLE} "
+            f"FOR VALUES IN ({ds_id})"
+        ))
+
+def replace_dataset_rows(db: Session, dataset_id: int) -> None:
+    """
+    Drops existing rows of a dataset inside the caller's transaction before a reload.
+    With list partitioning this is a TRUNCATE of the dataset's own partition.
+    """
+    if partitioning() == "list":
+        db.execute(text(f"TRUNCATE {dataset_partition_name(dataset_id)}"))
+    else:
+        db.execute(text(f"DELETE FROM {FACT_TABLE} WHERE dataset_id = :ds"), {"ds": int(dataset_id)})
+
+def detach_dataset_partition(conn: Connection, dataset_id: int) -> str:
+    """
+    Detaches a dataset's partition (list mode) and keeps it as a standalone
+    '<partition>_detached' table. A CHECK constraint is added first so it can be
+    re-attached without a validation scan.
+    """
+    if partitioning() != "list":
+        raise ValueError("Detaching dataset partitions requires list partitioning")
+    name = dataset_partition_name(dataset_id)
+    detached = f"{name}_detached"
+    conn.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT IF EXISTS {name}_ck"))
+    conn.execute(text(
+        f"ALTER TABLE {name} ADD CONSTRAINT {name}_ck CHECK (dataset_id = {int(dataset_id)})"
+    ))
+    conn.execute(text(f"ALTER TABLE {FACT_TABLE} DETACH PARTITION {name}"))
+    conn.execute(text(f"ALTER TABLE {name} RENAME TO {detached}"))
+    logger.info(f"Detached partition {name} -> {detached}")
+    return detached
+
+def attach_dataset_partition(conn: Connection, dataset_id: int, table_name: str) -> None:
+    """
+    Attaches a prepared table (same columns as the fact table) as the dataset's partition.
+    """
+    if partitioning() != "list":
+        raise ValueError("Attaching dataset partitions requires list partitioning")
+    conn.execute(text(
+        f"ALTER TABLE {FACT_TABLE} ATTACH PARTITION {table_name} FOR VALUES IN ({int(dataset_id)})"
+    ))
+    if table_name != dataset_partition_name(dataset_id):
+        conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {dataset_partition_name(dataset_id)}"))
+    logger.info(f"Attached {table_name} as partition for dataset {dataset_id}")
+
+def swap_dataset_partition(conn: Connection, dataset_id: int, staging_table: str) -> None:
+    """
+    Replaces a dataset's rows with a fully loaded staging table:
+    detach + drop the old partition, attach the staging table in its place.
+    """
+    old = detach_dataset_partition(conn, dataset_id)
+    conn.execute(text(f"DROP TABLE {old}"))
+    attach_dataset_partition(conn, dataset_id, staging_table)
+
+def list_partitions(conn: Connection) -> list[tuple[str, str]]:
+    rows = conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        f"WHERE i.inhparent = '{FACT_TABLE}'::regclass ORDER BY c.relname"
+    )).all()
+    return [(r[0], r[1]) for r in rows]
@@ -0,0 +1,143 @@
+import cProfile
+import io
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from src.tuik_pipeline.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Backs the --profile flag of the pipeline scripts. While a stage is profiled:
+#  - cProfile runs in the calling thread and in every thread started during the stage
+#    (loader workers); the profiles are merged into one .prof file
+#  - worker processes (the normalizer's sheet pool) profile their tasks with profile_worker()
+#    into worker_profile_dir(), and those profiles are merged in as well
+#  - tracemalloc tracks the stage's peak Python memory
+#  - record_item() collects per-item wall times for the "slowest items" table
+# Outside a profiled stage record_item() is a no-op, so the hooks cost nothing by default.
+
+PROFILE_DIR = Path("profiles")
+
+_lock = threading.Lock()
+_active = False
+_items: list[tuple[str, float, str]] = []
+_thread_profiles: list[cProfile.Profile] = []
+_worker_dir: Path | None = None
+
+def worker_profile_dir() -> str | None:
+    """
+    Directory worker processes dump their profiles into, or None outside a profiled stage.
+    Pass it to the task; spawned processes do not share this module's state.
+    """
+    return str(_worker_dir) if _active and _worker_dir else None
+
+@contextmanager
+def profile_worker(out_dir: str | None):
+    """
+    Profiles the enclosed task of a worker process into out_dir (no-op when None).
+    """
+    if out_dir is None:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(os.path.join(out_dir, f"{os.getpid()}-{time.monotonic_ns()}.prof"))
+
+def record_item(label: str, seconds: float, info: str = "") -> None:
+    if _active:
+        with _lock:
+            _items.append((label, seconds, info))
+
+def _start_thread_profile(frame, event, arg) -> None:
+    # Installed with threading.setprofile: runs once at the start of each new thread,
+    # where enabling a Profile replaces this hook with the C-level profiler
+    prof = cProfile.Profile()
+    try:
+        prof.enable()
+    except ValueError:
+        # Python 3.12+ profiles every thread from one Profile and refuses a second one
+        sys.setprofile(None)
+        return
+    with _lock:
+        _thread_profiles.append(prof)
+
+def slowest_items_table(items: list[tuple[str, float, str]], top: int) -> str:
+    rows = sorted(items, key=lambda r: r[1], reverse=True)[:top]
+    total = sum(s for _, s, _ in items)
+    lines = [f"{'seconds':>9}  {'share':>6}  item"]
+    for label, seconds, info in rows:
+        share = seconds / total * 100 if total else 0.0
+        lines.append(f"{seconds:9.3f}  {share:5.1f}%  {label}" + (f"  ({info})" if info else ""))
+    return "\n".join(lines)
+
+@contextmanager
+def profile_stage(stage: str, enabled: bool = True, top: int = 25, out_dir: Path = PROFILE_DIR):
+    """
+    Profiles the enclosed stage when enabled. On exit writes profiles/<stage>-<ts>.prof
+    (open with pstats or snakeviz) and prints the hottest functions by cumulative time,
+    peak traced memory and the slowest items.
+    """
+    global _active, _worker_dir
+    if not enabled:
+        yield
+        return
+
+    _items.clear()
+    _thread_profiles.clear()
+    _worker_dir = Path(tempfile.mkdtemp(prefix=f"{stage}-workers-"))
+    _active = True
+    tracemalloc.start()
+    threading.setprofile(_start_thread_profile)
+    prof = cProfile.Profile()
+    started = time.perf_counter()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        elapsed = time.perf_counter() - started
+        threading.setprofile(None)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _active = False
+
+        stats = pstats.Stats(prof)
+        for thread_prof in _thread_profiles:
+            thread_prof.disable()
+            stats.add(thread_prof)
+        worker_profiles = sorted(_worker_dir.glob("*.prof"))
+        for worker_prof in worker_profiles:
+            stats.add(str(worker_prof))
+        shutil.rmtree(_worker_dir, ignore_errors=True)
+        _worker_dir = None
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / f"{stage}-{datetime.now():%Y%m%d-%H%M%S}.prof"
+        stats.dump_stats(str(out_path))
+
+        buf = io.StringIO()
+        stats.stream = buf
+        stats.sort_stats("cumulative").print_stats(top)
+
+        print(f"\n=== Profile: {stage} ===")
+        print(f"wall={elapsed:.2f}s  peak_traced_memory={peak / 2**20:.1f} MiB  "
+              f"threads_profiled={1 + len(_thread_profiles)}  worker_tasks_profiled={len(worker_profiles)}  "
+              f"profile={out_path}")
+        print(buf.getvalue())
+        if _items:
+            print(f"Slowest items ({len(_items)} timed):")
+            print(slowest_items_table(_items, top=15))
+        logger.info(f"Profile written to {out_path}")
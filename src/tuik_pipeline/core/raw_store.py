@@ -0,0 +1,184 @@
+import csv
+import hashlib
+import os
+import re
+from io import BytesIO
+from pathlib import Path
+
+from sqlalchemy import text
+
+from src.tuik_pipeline.core.config import settings
+from src.tuik_pipeline.core.database import engine
+from src.tuik_pipeline.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Raw workbooks live in downloads/_store/<dataset_id>/. With RAW_STORE_ENABLED each download
+# is stored content-addressed as <sha256 of the raw bytes><ext>[.zst]:
+#  - refetching an unchanged workbook reuses its file instead of adding a version
+#  - files are zstd-compressed when the optional zstandard package is installed
+#    (legacy OLE2 .xls shrinks several-fold); readers decompress transparently
+#  - only the newest RAW_STORE_KEEP_VERSIONS files per dataset are kept, plus older ones
+#    that a keyword manifest or an unfinished pipeline run still points at
+# Without it, downloads are stored as <title><ext> exactly as before.
+
+DOWNLOADS_ROOT = Path("downloads")
+STORE_DIRNAME = "_store"
+ZSTD_SUFFIX = ".zst"
+EXCEL_SUFFIXES = (".xls", ".xlsx")
+
+BLOB_RE = re.compile(r"^([0-9a-f]{64})\.[a-z0-9]+(\.zst)?$")
+
+def _zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+def enabled() -> bool:
+    return settings.raw_store_enabled
+
+def compressing() -> bool:
+    return settings.raw_store_zstd_level > 0 and _zstd() is not None
+
+def dataset_dir(dataset_id: int, root: Path | None = None) -> Path:
+    return (root or DOWNLOADS_ROOT) / STORE_DIRNAME / str(int(dataset_id))
+
+def raw_suffix(path: Path) -> str:
+    """
+    Extension of the stored workbook itself: ".xls" for both "x.xls" and "x.xls.zst".
+    """
+    p = Path(path)
+    if p.suffix.lower() == ZSTD_SUFFIX:
+        p = p.with_suffix("")
+    return p.suffix.lower()
+
+def is_excel(path: Path) -> bool:
+    return raw_suffix(path) in EXCEL_SUFFIXES
+
+def blob_sha256(path: Path) -> str | None:
+    """
+    SHA-256 of the uncompressed content, read from a content-addressed file name
+    (None for files named after their title).
+    """
+    m = BLOB_RE.match(Path(path).name)
+    return m.group(1) if m else None
+
+def read_bytes(path: Path) -> bytes:
+    path = Path(path)
+    if path.suffix.lower() != ZSTD_SUFFIX:
+        return path.read_bytes()
+    zstd = _zstd()
+    if zstd is None:
+        raise RuntimeError(f"{path.name} is zstd-compressed; install the zstandard package to read it")
+    out = BytesIO()
+    with open(path, "rb") as f:
+        zstd.ZstdDecompressor().copy_stream(f, out)
+    return out.getvalue()
+
+def versions(directory: Path) -> list[Path]:
+    """
+    Stored workbooks of one dataset, newest first.
+    """
+    if not directory.is_dir():
+        return []
+    files = [p for p in directory.iterdir() if p.is_file() and is_excel(p)]
+    return sorted(files, key=lambda p: p.stat().st_mtime, reverse=True)
+
+def latest_version(dataset_id: int, root: Path | None = None) -> Path | None:
+    found = versions(dataset_dir(dataset_id, root))
+    return found[0] if found else None
+
+def _sha256(path: Path, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def archive(path: Path) -> Path:
+    """
+    Moves a freshly downloaded workbook to its content-addressed name, compressing it
+    when possible. An identical existing version is reused and marked as the newest.
+    """
+    sha = _sha256(path)
+    target = path.with_name(sha + path.suffix.lower() + (ZSTD_SUFFIX if compressing() else ""))
+    plain = path.with_name(sha + path.suffix.lower())
+    existing = next((p for p in (target, plain, plain.with_name(plain.name + ZSTD_SUFFIX)) if p.exists()), None)
+
+    if existing is not None and existing != path:
+        path.unlink()
+        os.utime(existing)
+        logger.info(f"Raw store: {existing.name} unchanged, reusing it")
+        return existing
+
+    if target.suffix == ZSTD_SUFFIX:
+        size = path.stat().st_size
+        tmp = target.with_name(target.name + ".tmp")
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            _zstd().ZstdCompressor(level=settings.raw_store_zstd_level).copy_stream(src, dst, size=size)
+        os.replace(tmp, target)
+        path.unlink()
+        logger.info(f"Raw store: {target.name} {size} -> {target.stat().st_size} bytes")
+    elif target != path:
+        os.replace(path, target)
+    return target
+
+def referenced_paths(root: Path | None = None) -> set[Path]:
+    """
+    Stored workbooks something still reads: the saved_path of every keyword manifest
+    (the normalizer's input) and of items in runs that can still be resumed.
+    """
+    root = root or DOWNLOADS_ROOT
+    paths = set()
+    for manifest in root.glob("*/manifest.csv"):
+        with open(manifest, newline="", encoding="utf-8") as f:
+            paths.update(row["saved_path"] for row in csv.DictReader(f) if row.get("saved_path"))
+    with engine.connect() as conn:
+        paths.update(conn.execute(text(
+            "SELECT i.saved_path FROM run_items i JOIN pipeline_runs r ON r.id = i.run_id "
+            "WHERE r.status <> 'done' AND i.saved_path IS NOT NULL"
+        )).scalars())
+    return {Path(p).resolve() for p in paths}
+
+def forget(paths: list[Path]) -> None:
+    """
+    Drops ledger rows whose input was one of the removed workbooks.
+    """
+    names = [str(p) for p in paths] + [str(p.resolve()) for p in paths]
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM artifacts WHERE input_path = ANY(:names)"), {"names": names})
+
+def prune(directory: Path, keep: int) -> list[Path]:
+    """
+    Deletes all but the newest `keep` stored workbooks of a dataset, skipping older ones
+    that are still referenced (see referenced_paths).
+    """
+    candidates = versions(directory)[max(1, keep):]
+    if not candidates:
+        return []
+
+    referenced = referenced_paths(directory.parent.parent)
+    removed = []
+    for p in candidates:
+        if p.resolve() in referenced:
+            logger.info(f"Raw store: keeping old version {p}, still referenced")
+            continue
+        p.unlink(missing_ok=True)
+        removed.append(p)
+        logger.info(f"Raw store: removed old version {p}")
+    if removed:
+        forget(removed)
+    return removed
+
+def store_download(path: Path) -> Path:
+    """
+    Archives a completed download and applies the retention policy; returns the path to
+    record in manifests. A no-op when the raw store is disabled.
+    """
+    if not enabled():
+        return path
+    stored = archive(path)
+    prune(stored.parent, settings.raw_store_keep_versions)
+    return stored
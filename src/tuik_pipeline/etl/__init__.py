@@ -1,7 +1,14 @@
-from .extractors import update_categories_yaml, seed_datasets
-from .downloader import run_downloader_pipeline
-from .normalizer import run_normalization_pipeline
-from .loader import run_loader_pipeline
+from importlib import import_module
+
+# Stage entry points are resolved on first access, so importing a light submodule
+# (e.g. etl.jobs from the API) does not pull in pandas/requests.
+_EXPORTS = {
+    "update_categories_yaml": ".extractors",
+    "seed_datasets": ".extractors",
+    "run_downloader_pipeline": ".downloader",
+    "run_normalization_pipeline": ".normalizer",
+    "run_loader_pipeline": ".loader",
+}
 
 __all__ = [
     "update_categories_yaml",
@@ -10,3 +17,8 @@ __all__ = [
     "run_normalization_pipeline",
     "run_loader_pipeline",
 ]
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
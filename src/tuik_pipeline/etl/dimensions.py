@@ -0,0 +1,78 @@
+import threading
+from typing import Iterable
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+
+from src.tuik_pipeline.core.database import engine as default_engine
+from src.tuik_pipeline.models.metric import Metric
+from src.tuik_pipeline.models.dimension import Dimension
+from src.tuik_pipeline.models.source_file import SourceFile
+
+
+class DimensionCache:
+    """
+    In-memory map of dimension strings to their integer keys.
+
+    Missing keys are created in bulk (INSERT ... ON CONFLICT DO NOTHING, then one SELECT)
+    on a short transaction of their own, so they survive a rolled back file load and
+    never hold locks inside the loader's transaction.
+    """
+
+    def __init__(self, bind: Engine | None = None):
+        self.bind = bind or default_engine
+        self._lock = threading.Lock()
+        self._metrics: dict[str, int] = {}
+        self._dimensions: dict[str, dict[str, int]] = {}
+        self._source_files: dict[str, int] = {}
+
+    def metric_ids(self, names: Iterable[str]) -> dict[str, int]:
+        wanted = {n for n in names if n is not None}
+        with self._lock:
+            missing = sorted(wanted - self._metrics.keys())
+            if missing:
+                with self.bind.begin() as conn:
+                    conn.execute(
+                        pg_insert(Metric)
+                        .values([{"name": n} for n in missing])
+                        .on_conflict_do_nothing(index_elements=["name"])
+                    )
+                    rows = conn.execute(
+                        select(Metric.name, Metric.id).where(Metric.name.in_(missing))
+                    ).all()
+                self._metrics.update(dict(rows))
+            return {n: self._metrics[n] for n in wanted}
+
+    def dimension_ids(self, kind: str, values: Iterable[str]) -> dict[str, int]:
+        wanted = {v for v in values if v is not None}
+        with self._lock:
+            known = self._dimensions.setdefault(kind, {})
+            missing = sorted(wanted - known.keys())
+            if missing:
+                with self.bind.begin() as conn:
+                    conn.execute(
+                        pg_insert(Dimension)
+                        .values([{"kind": kind, "value": v} for v in missing])
+                        .on_conflict_do_nothing(index_elements=["kind", "value"])
+                    )
+                    rows = conn.execute(
+                        select(Dimension.value, Dimension.id)
+                        .where(Dimension.kind == kind)
+                        .where(Dimension.value.in_(missing))
+                    ).all()
+                known.update(dict(rows))
+            return {v: known[v] for v in wanted}
+
+    def source_file_id(self, path: str) -> int:
+        with self._lock:
+            if path not in self._source_files:
+                with self.bind.begin() as conn:
+                    conn.execute(
+                        pg_insert(SourceFile)
+                        .values(path=path)
+                        .on_conflict_do_nothing(index_elements=["path"])
+                    )
+                    self._source_files[path] = conn.execute(
+                        select(SourceFile.id).where(SourceFile.path == path)
+                    ).scalar_one()
+            return self._source_files[path]
@@ -1,5 +1,9 @@
 import re
+import os
 import csv
+import json
+import time
+import hashlib
 import yaml
 import requests
 import sys
@@ -8,9 +12,14 @@ from sqlalchemy import select, or_
 from sqlalchemy.orm import Session
 from typing import Optional
 
+from src.tuik_pipeline.core.config import settings
 from src.tuik_pipeline.core.logging import get_logger
-from src.tuik_pipeline.core.database import SessionLocal
+from src.tuik_pipeline.core.database import SessionLocal, advisory_lock
+from src.tuik_pipeline.core import raw_store
+from src.tuik_pipeline.core.raw_store import STORE_DIRNAME
 from src.tuik_pipeline.models.dataset import Dataset
+from src.tuik_pipeline.etl import runs
+from src.tuik_pipeline.core.profiling import record_item
 
 logger = get_logger(__name__)
 
@@ -75,23 +84,173 @@ def sniff_extension_from_bytes(data: bytes) -> str:
         return ".xls"
     return ".bin"
 
-def download_file(url: str, title: str, out_dir: Path) -> Path:
-    resp = requests.get(url, timeout=90)
-    resp.raise_for_status()
-    data = resp.content
-    ext = sniff_extension_from_bytes(data)
+class IncompleteDownload(IOError):
+    pass
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Persist the byte offset every this many bytes
+CHECKPOINT_BYTES = 8 << 20
+
+def part_paths(url: str, out_dir: Path) -> tuple[Path, Path]:
+    """
+    Partial download file and its sidecar metadata (url, validators, total, offset).
+    """
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    parts_dir = out_dir / ".parts"
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    return parts_dir / f"{key}.part", parts_dir / f"{key}.part.json"
+
+def save_part_meta(meta_path: Path, meta: dict) -> None:
+    tmp = meta_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp, meta_path)
+
+def load_part_meta(meta_path: Path, url: str) -> dict:
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return meta if meta.get("url") == url else {}
+
+def parse_content_range(value: str | None) -> tuple[int, int | None] | None:
+    # "bytes 100-199/1000" or "bytes 100-199/*"
+    m = re.match(r"bytes\s+(\d+)-\d+/(\d+|\*)", value or "")
+    if not m:
+        return None
+    return int(m.group(1)), (None if m.group(2) == "*" else int(m.group(2)))
+
+def fetch_to_part(url: str, part: Path, meta_path: Path) -> None:
+    """
+    Fetches url into `part`, continuing from the persisted offset with a Range request.
+    If-Range makes the server send the whole file instead if it changed in between.
+    """
+    meta = load_part_meta(meta_path, url)
+    offset = min(part.stat().st_size, int(meta.get("offset", 0))) if meta and part.exists() else 0
+
+    headers = {"Accept-Encoding": "identity"}
+    if offset > 0:
+        headers["Range"] = f"bytes={offset}-"
+        etag = meta.get("etag")
+        validator = etag if etag and not etag.startswith("W/") else meta.get("last_modified")
+        if validator:
+            headers["If-Range"] = validator
+
+    timeout = (settings.download_connect_timeout, settings.download_read_timeout)
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as resp:
+        if resp.status_code == 416:
+            if meta.get("total") == offset:
+                return  # Already complete
+            # Stale partial data; start over on the next attempt
+            part.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            raise IncompleteDownload("Range not satisfiable, restarting")
+        resp.raise_for_status()
+
+        content_range = parse_content_range(resp.headers.get("Content-Range"))
+        if offset > 0 and resp.status_code == 206 and content_range and content_range[0] == offset:
+            total = content_range[1]
+        else:
+            # Fresh start: no partial data, range ignored, or the file changed upstream
+            if offset > 0:
+                logger.info(f"Restarting download from byte 0: {url}")
+            offset = 0
+            length = resp.headers.get("Content-Length")
+            total = int(length) if length and length.isdigit() else None
+
+        meta = {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "total": total,
+            "offset": offset,
+        }
+        save_part_meta(meta_path, meta)
+
+        with open(part, "r+b" if offset > 0 else "wb") as f:
+            f.seek(offset)
+            f.truncate()
+            unsynced = 0
+            try:
+                for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    offset += len(chunk)
+                    unsynced += len(chunk)
+                    if unsynced >= CHECKPOINT_BYTES:
+                        f.flush()
+                        os.fsync(f.fileno())
+                        meta["offset"] = offset
+                        save_part_meta(meta_path, meta)
+                        unsynced = 0
+            finally:
+                # Keep whatever arrived before an interruption
+                f.flush()
+                os.fsync(f.fileno())
+                meta["offset"] = offset
+                save_part_meta(meta_path, meta)
+
+    if total is not None and offset != total:
+        raise IncompleteDownload(f"Got {offset} of {total} bytes")
+
+def download_file(url: str, title: str, out_dir: Path, overwrite: bool = False) -> Path:
+    """
+    Downloads via a .part file that survives failures; retries resume from the
+    persisted offset. The completed file is verified against Content-Length.
+    With overwrite=True an existing file of the same name is replaced instead of suffixed.
+    """
+    part, meta_path = part_paths(url, out_dir)
+
+    for attempt in range(1, max(1, settings.download_retries) + 1):
+        try:
+            fetch_to_part(url, part, meta_path)
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError, IncompleteDownload) as e:
+            if attempt >= settings.download_retries:
+                raise
+            wait = min(2 ** attempt, 30)
+            logger.warning(f"Download interrupted ({e}); resuming in {wait}s [{attempt}/{settings.download_retries}]")
+            time.sleep(wait)
+
+    with open(part, "rb") as f:
+        ext = sniff_extension_from_bytes(f.read(8))
     clean_title = normalize_title(title)
     fname = safe_filename(clean_title) + ext
-    path = get_unique_path(out_dir / fname)
-    path.write_bytes(data)
+    path = out_dir / fname if overwrite else get_unique_path(out_dir / fname)
+    os.replace(part, path)
+    meta_path.unlink(missing_ok=True)
     return path
 
+def plan_downloads(all_results: dict[str, list]) -> dict[int, tuple[str, str, str, list[str]]]:
+    """
+    Merges keyword search results into one download per dataset_id:
+    dataset_id -> (group_name, title, download_url, [keywords]).
+    """
+    plan: dict[int, tuple[str, str, str, list[str]]] = {}
+    for kw, rows in all_results.items():
+        for ds_id, grp, title, url in rows:
+            if not url:
+                continue
+            if ds_id in plan:
+                plan[ds_id][3].append(kw)
+            else:
+                plan[ds_id] = (grp, title, url, [kw])
+    return plan
+
 def run_downloader_pipeline(
     keyword_arg: Optional[str] = None, 
     config_path: str = "config/crawl.yaml", 
-    skip_prompt: bool = False
-):
-    if keyword_arg:
+    skip_prompt: bool = False,
+    resume_run_id: Optional[int] = None
+) -> Optional[int]:
+    """
+    Searches all keywords, downloads each matching dataset once into the shared store
+    and writes one manifest per keyword pointing at it. Progress is tracked as a
+    pipeline run; resuming a run skips items that were already downloaded.
+    Returns the run id (None if nothing was downloaded).
+    """
+    if resume_run_id:
+        keywords = runs.run_keywords(resume_run_id)
+        skip_prompt = True
+    elif keyword_arg:
         keywords = [keyword_arg]
     else:
         cfg = load_config(config_path)
@@ -114,61 +273,102 @@ def run_downloader_pipeline(
 
         if total_rows == 0:
             logger.info("No records found to download.")
-            return
+            return None
 
         if not skip_prompt:
             ans = input("\nDo you want to proceed with downloading? (y/n): ").strip().lower()
             if ans not in ("y", "yes", "evet", "e"):
                 logger.info("Download cancelled.")
-                return # Simply return, caller script checks for manifest file creation
+                return None # Simply return, caller script checks for manifest file creation
+
+        if resume_run_id:
+            run_id = resume_run_id
+            runs.reopen_run(run_id)
+        else:
+            run_id = runs.create_run(keywords)
+
+        runs.register_items(run_id, [(kw, ds_id) for kw in keywords for ds_id, *_ in all_results.get(kw, [])])
+        items = runs.item_states(run_id)
 
         downloads_root = Path("downloads")
+        store_root = downloads_root / STORE_DIRNAME
+        plan = plan_downloads(all_results)
+        logger.info(f"Download plan: {len(plan)} unique dataset(s) for {total_rows} keyword match(es)")
+
+        # Download each planned dataset once into the shared store
+        saved_paths: dict[int, str] = {}
         grand_ok = 0
         grand_fail = 0
+        grand_skip = 0
+
+        for ds_id, (grp, title, url, kws) in plan.items():
+            previous = next(
+                (
+                    item.saved_path for item in (items.get((kw, ds_id)) for kw in kws)
+                    if item and runs.reached(item.state, "downloaded")
+                    and item.saved_path and Path(item.saved_path).exists()
+                ),
+                None,
+            )
+            if previous:
+                saved_paths[ds_id] = previous
+                grand_skip += 1
+                logger.info(f"[{ds_id}] SKIP (already downloaded) -> {Path(previous).name}")
+                for kw in kws:
+                    runs.set_item_state(run_id, ds_id, "downloaded", keyword=kw, saved_path=previous)
+                continue
+
+            item_started = time.perf_counter()
+            try:
+                # One writer per store folder, even across concurrent job workers
+                with advisory_lock(f"download:{ds_id}"):
+                    saved = download_file(url, title, store_root / str(ds_id), overwrite=True)
+                    saved = raw_store.store_download(saved)
+                saved_paths[ds_id] = str(saved)
+                for kw in kws:
+                    runs.set_item_state(run_id, ds_id, "downloaded", keyword=kw, saved_path=str(saved))
+                grand_ok += 1
+                logger.info(f"[{ds_id}] OK -> {saved.name} (keywords: {', '.join(kws)})")
+            except Exception as e:
+                grand_fail += 1
+                for kw in kws:
+                    runs.set_item_state(run_id, ds_id, "failed", keyword=kw, error=str(e))
+                logger.error(f"[{ds_id}] ERR -> {title} | {e}")
+            finally:
+                record_item(f"[{ds_id}] {title}", time.perf_counter() - item_started, url)
 
+        # Per-keyword manifests point at the shared store
         for kw in keywords:
             rows = all_results.get(kw, [])
             if not rows: continue
 
             kw_folder = downloads_root / safe_dirname(kw)
             kw_folder.mkdir(parents=True, exist_ok=True)
+            (kw_folder / "run_id").write_text(str(run_id), encoding="utf-8")
             
             manifest_path = kw_folder / "manifest.csv"
             
             with open(manifest_path, "w", newline="", encoding="utf-8") as f:
                 writer = csv.DictWriter(
                     f,
-                    fieldnames=["dataset_id","keyword","group_name","title","download_url","saved_path"],
+                    fieldnames=["dataset_id","keyword","group_name","title","download_url","saved_path","run_id"],
                 )
                 writer.writeheader()
-                kw_ok = 0
-                kw_fail = 0
-
-                for i, (ds_id, grp, title, url) in enumerate(rows, start=1):
-                    if not url: continue
-                    grp_folder = kw_folder / safe_dirname(grp or "unknown_group")
-                    grp_folder.mkdir(parents=True, exist_ok=True)
-                    try:
-                        saved = download_file(url, title, grp_folder)
-                        clean_title = normalize_title(title)
-                        writer.writerow({
-                            "dataset_id": ds_id,
-                            "keyword": kw,
-                            "group_name": grp,
-                            "title": clean_title,
-                            "download_url": url,
-                            "saved_path": str(saved),
-                        })
-                        kw_ok += 1
-                        logger.info(f"[{kw}] OK -> {saved.name}")
-                    except Exception as e:
-                        kw_fail += 1
-                        logger.error(f"[{kw}] ERR -> {title} | {e}")
-                
-                grand_ok += kw_ok
-                grand_fail += kw_fail
+
+                for ds_id, grp, title, url in rows:
+                    if ds_id not in saved_paths: continue
+                    writer.writerow({
+                        "dataset_id": ds_id,
+                        "keyword": kw,
+                        "group_name": grp,
+                        "title": normalize_title(title),
+                        "download_url": url,
+                        "saved_path": saved_paths[ds_id],
+                        "run_id": run_id,
+                    })
         
-        logger.info(f"Download Summary: OK={grand_ok} FAIL={grand_fail}")
+        logger.info(f"Download Summary: RUN={run_id} OK={grand_ok} SKIP={grand_skip} FAIL={grand_fail}")
+        return run_id
         
     finally:
         db.close()
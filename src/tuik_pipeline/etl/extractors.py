@@ -1,4 +1,5 @@
 import sys
+import time
 import requests
 import yaml
 import re
@@ -11,8 +12,10 @@ from sqlalchemy.orm import Session
 from src.tuik_pipeline.core.logging import get_logger
 from src.tuik_pipeline.services.tuik_client import TuikClient
 from src.tuik_pipeline.models.dataset import Dataset
+from src.tuik_pipeline.models.category import Category
 from src.tuik_pipeline.core.config import settings
 from src.tuik_pipeline.core.database import SessionLocal
+from src.tuik_pipeline.core.profiling import record_item
 
 logger = get_logger(__name__)
 
@@ -93,12 +96,16 @@ def update_categories_yaml(output_path: Path) -> int:
 def normalize_download_path(path: str) -> str:
     return urlparse(path).path
 
-def load_parent_ids_from_yaml(yaml_path: Path) -> list[int]:
+def load_parent_pages_from_yaml(yaml_path: Path) -> list[tuple[int, str]]:
+    """
+    (parent_id, slug) of every category page in the yaml, e.g. (103, "Cevre-ve-Enerji").
+    """
     with open(yaml_path, "r", encoding="utf-8") as f:
         data = yaml.safe_load(f) or {}
 
     urls = data.get("categories_pages", [])
-    parent_ids = []
+    pages = []
+    seen = set()
     for u in urls:
         parsed = urlparse(u)
         p = parse_qs(parsed.query).get("p", [None])[0]
@@ -106,19 +113,67 @@ def load_parent_ids_from_yaml(yaml_path: Path) -> list[int]:
             continue
 
         # e.g.: "Cevre-ve-Enerji-103" -> capture last digits
-        m = re.search(r"-(\d+)$", p)
+        m = re.search(r"^(.*)-(\d+)$", p)
         if not m:
             continue
-        parent_ids.append(int(m.group(1)))
 
-    # unique while preserving order
-    uniq = []
+        # unique while preserving order
+        pid = int(m.group(2))
+        if pid not in seen:
+            seen.add(pid)
+            pages.append((pid, m.group(1)))
+    return pages
+
+def load_parent_ids_from_yaml(yaml_path: Path) -> list[int]:
+    return [pid for pid, _ in load_parent_pages_from_yaml(yaml_path)]
+
+# Sub-category filters post back as AltIdler[]; other checkboxes (years, periods) do not
+CHILD_CATEGORY_SELECTOR = 'input[type="checkbox"][name^="AltIdler" i][value]'
+
+def parse_child_categories(html: str) -> list[tuple[int, str, int | None]]:
+    """
+    Sub-categories offered as AltIdler filters on a category page, as (id, name, parent id).
+    Names come from the <label for=...> (or the enclosing element). A filter nested inside
+    another filter's list item is its child; top-level filters have parent None.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    inputs = soup.select(CHILD_CATEGORY_SELECTOR)
+
+    # The element that holds each filter (and, when nested, its sub-filters)
+    owners = {}
+    shared = set()
+    for inp in inputs:
+        container = inp.find_parent("li") or inp.parent
+        if id(container) in owners:
+            shared.add(id(container))
+        owners[id(container)] = inp
+    for key in shared:
+        del owners[key]
+
+    children = []
     seen = set()
-    for x in parent_ids:
-        if x not in seen:
-            seen.add(x)
-            uniq.append(x)
-    return uniq
+    for inp in inputs:
+        value = inp["value"].strip()
+        if not value.isdigit() or value in seen:
+            continue
+
+        label = soup.find("label", attrs={"for": inp["id"]}) if inp.get("id") else None
+        name = (label or inp.parent).get_text(" ", strip=True)
+        if not name:
+            continue
+
+        parent_id = None
+        for anc in inp.parents:
+            owner = owners.get(id(anc))
+            if owner is not None and owner is not inp:
+                parent_value = owner["value"].strip()
+                parent_id = int(parent_value) if parent_value.isdigit() else None
+                break
+
+        seen.add(value)
+        children.append((int(value), name, parent_id))
+
+    return children
 
 def parse_dataset_page(html: str) -> list[dict]:
     soup = BeautifulSoup(html, "lxml")
@@ -163,13 +218,62 @@ def parse_dataset_page(html: str) -> list[dict]:
 
     return items
 
-def upsert_datasets(db: Session, parent_id: int, items: list[dict]) -> int:
+def upsert_category(db: Session, tuik_key: str, name: str, parent: Category | None) -> Category:
+    """
+    Inserts or updates one category; its path extends the parent's with the last key part.
+    """
+    path = (parent.path if parent else "") + tuik_key.rsplit("/", 1)[-1] + "/"
+    cat = db.execute(select(Category).where(Category.tuik_key == tuik_key)).scalar_one_or_none()
+    if cat is None:
+        cat = Category(tuik_key=tuik_key, name=name, parent_id=parent.id if parent else None, path=path)
+        db.add(cat)
+    else:
+        cat.name = name
+        cat.parent_id = parent.id if parent else None
+        cat.path = path
+    db.flush()
+    return cat
+
+def throttle() -> None:
+    if settings.requests_rps > 0:
+        time.sleep(1.0 / settings.requests_rps)
+
+def fetch_all_tables(
+    client: TuikClient,
+    parent_id: int,
+    child_ids: list[int] | None = None,
+    referer: str | None = None,
+    count: int = 50,
+    max_pages: int = 20,
+) -> list[dict]:
+    """
+    Pages through the statistical tables of a category (optionally filtered to sub-categories)
+    until a short or repeated page.
+    """
+    items = []
+    seen = set()
+    for page in range(1, max_pages + 1):
+        html = client.get_statistical_tables(
+            parent_id=parent_id, page=page, count=count, lang_id=1, archive=False,
+            child_ids=child_ids, referer=referer,
+        )
+        throttle()
+
+        new_items = [it for it in parse_dataset_page(html) if (it["download_path"], it["title"]) not in seen]
+        seen.update((it["download_path"], it["title"]) for it in new_items)
+        items.extend(new_items)
+        if len(new_items) < count:
+            break
+    return items
+
+def upsert_datasets(db: Session, parent_id: int, items: list[dict], category: Category | None = None) -> int:
     uniq = {}
     for it in items:
         key = (parent_id, it["download_path"], it["title"])
         uniq[key] = it
     items = list(uniq.values())
     new_count = 0
+    category_fields = {"category_id": category.id, "category_path": category.path} if category else {}
 
     for it in items:
         # Check existing using ORM
@@ -185,6 +289,8 @@ def upsert_datasets(db: Session, parent_id: int, items: list[dict]) -> int:
             existing.title = it["title"]
             existing.publish_date_raw = it["date"]
             existing.download_url = it["download_url"]
+            for k, v in category_fields.items():
+                setattr(existing, k, v)
         else:
             db.add(Dataset(
                 ust_id=parent_id,
@@ -194,34 +300,77 @@ def upsert_datasets(db: Session, parent_id: int, items: list[dict]) -> int:
                 download_path=it["download_path"],
                 download_url=it["download_url"],
                 is_archived=False,
+                **category_fields,
             ))
             new_count += 1
 
     db.commit()
     return new_count
 
-def seed_datasets(yaml_path: Path):
+def seed_datasets(yaml_path: Path, crawl_children: bool = True):
+    """
+    Seeds datasets of every top category in the yaml. With crawl_children, the category
+    tree is stored as well: each top category page is scanned for its sub-categories at
+    every nesting level, and datasets listed under a sub-category (AltIdler filter) are
+    linked to the deepest one. Datasets found
+    under no sub-category stay linked to the top category.
+    """
     client = TuikClient()
-    parent_ids = load_parent_ids_from_yaml(yaml_path)
-    logger.info(f"Loaded {len(parent_ids)} parent IDs from {yaml_path}")
+    parent_pages = load_parent_pages_from_yaml(yaml_path)
+    logger.info(f"Loaded {len(parent_pages)} parent IDs from {yaml_path}")
 
     grand_total = 0
     grand_new = 0
+    grand_children = 0
 
     with SessionLocal() as db:
-        for pid in parent_ids:
+        for pid, slug in parent_pages:
+            item_started = time.perf_counter()
             try:
-                html = client.get_statistical_tables(
-                    parent_id=pid, page=1, count=50, lang_id=1, archive=False
-                )
-                items = parse_dataset_page(html)
-                new_count = upsert_datasets(db, pid, items)
-                
-                logger.debug(f"[Parent {pid}] total_items={len(items)} new_inserted={new_count}")
+                root = upsert_category(db, str(pid), slug.replace("-", " "), None)
+
+                referer = None
+                children = []
+                if crawl_children:
+                    referer = client.category_url(pid, slug)
+                    children = parse_child_categories(client.get_category_page(pid, slug))
+                    throttle()
+
+                items = fetch_all_tables(client, pid, referer=referer)
+                new_count = upsert_datasets(db, pid, items, category=root)
+
+                # Depth first from the top-level filters, so a dataset listed under several
+                # levels ends up linked to the deepest one
+                known = {cid for cid, _, _ in children}
+                by_parent: dict[int | None, list[tuple[int, str]]] = {}
+                for cid, cname, parent_cid in children:
+                    by_parent.setdefault(parent_cid if parent_cid in known else None, []).append((cid, cname))
+                stack = [(cid, cname, root) for cid, cname in reversed(by_parent.get(None, []))]
+                visited = set()
+                while stack:
+                    cid, cname, parent_cat = stack.pop()
+                    if cid in visited:
+                        continue
+                    visited.add(cid)
+                    child = upsert_category(db, f"{parent_cat.tuik_key}/{cid}", cname, parent_cat)
+                    child_items = fetch_all_tables(client, pid, child_ids=[cid], referer=referer)
+                    new_count += upsert_datasets(db, pid, child_items, category=child)
+                    logger.debug(f"[Parent {pid} / {child.path}] {cname}: items={len(child_items)}")
+                    stack.extend((gid, gname, child) for gid, gname in reversed(by_parent.get(cid, [])))
+                db.commit()
+
+                logger.debug(f"[Parent {pid}] total_items={len(items)} new_inserted={new_count} children={len(children)}")
 
                 grand_total += len(items)
                 grand_new += new_count
+                grand_children += len(children)
             except Exception as e:
+                db.rollback()
                 logger.error(f"Error seeding for parent {pid}: {e}")
+            finally:
+                record_item(f"[{pid}] {slug}", time.perf_counter() - item_started)
 
-    logger.info(f"Done. grand_total_items={grand_total} grand_new_inserted={grand_new}")
+    logger.info(
+        f"Done. grand_total_items={grand_total} grand_new_inserted={grand_new} "
+        f"sub_categories={grand_children}"
+    )
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.tuik_pipeline.core.config import settings
+from src.tuik_pipeline.core.database import SessionLocal
+from src.tuik_pipeline.core.logging import get_logger
+from src.tuik_pipeline.models.job import Job
+
+logger = get_logger(__name__)
+
+# Like the run helpers, every queue operation commits on its own short session.
+
+ACTIVE = ("queued", "running")
+
+def enqueue(keywords: list[str]) -> list[Job]:
+    """
+    Queues one job per keyword. A keyword that is already queued or running is not
+    queued twice; its existing job is returned instead. The partial unique index
+    uq_jobs_active_keyword makes this hold for concurrent enqueues too.
+    """
+    with SessionLocal() as db:
+        jobs = []
+        for kw in dict.fromkeys(k.strip() for k in keywords if k.strip()):
+            db.execute(
+                pg_insert(Job)
+                .values(keyword=kw, status="queued", attempts=0)
+                .on_conflict_do_nothing(index_elements=["keyword"], index_where=Job.status.in_(ACTIVE))
+            )
+            jobs.append(db.scalars(
+                select(Job).where(Job.keyword == kw).where(Job.status.in_(ACTIVE))
+            ).one())
+        db.commit()
+        logger.info(f"Enqueued jobs: {[j.id for j in jobs]}")
+        return jobs
+
+def claim_job(worker: str) -> Job | None:
+    """
+    Takes the oldest queued job. SKIP LOCKED lets any number of workers poll at once
+    without blocking on (or double-claiming) each other's rows.
+    """
+    with SessionLocal() as db:
+        job = db.scalars(
+            select(Job)
+            .where(Job.status == "queued")
+            .order_by(Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if job is None:
+            db.rollback()
+            return None
+        job.status = "running"
+        job.worker = worker
+        job.attempts += 1
+        job.error = None
+        job.started_at = func.now()
+        job.heartbeat_at = func.now()
+        job.finished_at = None
+        db.commit()
+        db.refresh(job)
+        return job
+
+def heartbeat(job_id: int, worker: str) -> bool:
+    """
+    Extends the running job's lease. False if the job is no longer held by `worker`
+    (it was requeued and possibly claimed by another worker).
+    """
+    with SessionLocal() as db:
+        res = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker == worker, Job.status == "running")
+            .values(heartbeat_at=func.now())
+        )
+        db.commit()
+    return res.rowcount == 1
+
+def finish_job(
+    job_id: int,
+    status: str,
+    run_id: int | None = None,
+    error: str | None = None,
+    worker: str | None = None,
+) -> None:
+    """
+    Records the job's outcome. With `worker`, only while that worker still holds the job,
+    so a worker that lost its lease cannot overwrite the new owner's state.
+    """
+    values = {"status": status, "error": error, "finished_at": func.now()}
+    if run_id is not None:
+        values["run_id"] = run_id
+    stmt = update(Job).where(Job.id == job_id)
+    if worker is not None:
+        stmt = stmt.where(Job.worker == worker, Job.status == "running")
+    with SessionLocal() as db:
+        res = db.execute(stmt.values(**values))
+        db.commit()
+    if worker is not None and res.rowcount == 0:
+        logger.warning(f"[job {job_id}] no longer held by {worker}; result {status!r} not recorded")
+
+def set_job_run(job_id: int, run_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(update(Job).where(Job.id == job_id).values(run_id=run_id))
+        db.commit()
+
+def requeue_stale(minutes: int | None = None) -> int:
+    """
+    Puts "running" jobs whose heartbeat is older than `minutes` back in the queue
+    (their worker died). A requeued job resumes its pipeline run instead of starting over.
+    """
+    minutes = settings.job_stale_minutes if minutes is None else minutes
+    with SessionLocal() as db:
+        res = db.execute(
+            update(Job)
+            .where(Job.status == "running")
+            .where(func.coalesce(Job.heartbeat_at, Job.started_at) < func.now() - timedelta(minutes=minutes))
+            .values(status="queued", worker=None)
+        )
+        db.commit()
+    if res.rowcount:
+        logger.warning(f"Requeued {res.rowcount} stale job(s)")
+    return res.rowcount
@@ -0,0 +1,76 @@
+import hashlib
+import json
+from pathlib import Path
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.tuik_pipeline.models.artifact import Artifact
+
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def params_json(params: dict) -> str:
+    return json.dumps(params, sort_keys=True, ensure_ascii=False)
+
+def get_artifact(db: Session, stage: str, input_path: Path, scope: str = "") -> Artifact | None:
+    return db.execute(
+        select(Artifact)
+        .where(Artifact.stage == stage)
+        .where(Artifact.input_path == str(input_path))
+        .where(Artifact.scope == scope)
+    ).scalar_one_or_none()
+
+def is_fresh(
+    artifact: Artifact | None,
+    sha256: str,
+    code_version: str,
+    params: dict,
+    ok_status: str,
+) -> bool:
+    """
+    True if the recorded run used the same input bytes, code version and params,
+    succeeded, and all of its outputs still exist.
+    """
+    if artifact is None:
+        return False
+    if (artifact.input_sha256, artifact.code_version, artifact.params, artifact.status) != (
+        sha256, code_version, params_json(params), ok_status
+    ):
+        return False
+    return all(Path(p).exists() for p in json.loads(artifact.output_paths or "[]"))
+
+def record_artifact(
+    db: Session,
+    stage: str,
+    input_path: Path,
+    sha256: str,
+    code_version: str,
+    params: dict,
+    status: str,
+    output_paths: list[str] | None = None,
+    scope: str = "",
+) -> None:
+    """
+    Upserts the ledger row; the caller commits (so it lands with the stage's own writes).
+    """
+    values = {
+        "stage": stage,
+        "input_path": str(input_path),
+        "scope": scope,
+        "input_sha256": sha256,
+        "code_version": code_version,
+        "params": params_json(params),
+        "output_paths": json.dumps(output_paths or [], ensure_ascii=False),
+        "status": status,
+    }
+    stmt = pg_insert(Artifact).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["stage", "input_path", "scope"],
+        set_={**{k: stmt.excluded[k] for k in values if k not in ("stage", "input_path", "scope")}, "updated_at": func.now()},
+    )
+    db.execute(stmt)
@@ -1,112 +1,385 @@
+import csv
+import os
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from sqlalchemy import select
+from typing import Callable, Iterator
+from sqlalchemy import insert, delete, select
 from sqlalchemy.orm import Session
 
+from src.tuik_pipeline.core.config import settings
 from src.tuik_pipeline.core.logging import get_logger
-from src.tuik_pipeline.core.database import SessionLocal
-from src.tuik_pipeline.models.dataset import Dataset
+from src.tuik_pipeline.core.database import SessionLocal, engine
+from src.tuik_pipeline.core.partitions import ensure_partitions, replace_dataset_rows
+from src.tuik_pipeline.models.artifact import Artifact
 from src.tuik_pipeline.models.observation import Observation
+from src.tuik_pipeline.etl.dimensions import DimensionCache
+from src.tuik_pipeline.etl.rollups import refresh_rollups
+from src.tuik_pipeline.core.arrow_store import publish_datasets
+from src.tuik_pipeline.core.profiling import record_item
+from src.tuik_pipeline.etl.resolver import DatasetResolver
+from src.tuik_pipeline.etl.ledger import file_sha256, get_artifact, is_fresh, record_artifact
+from src.tuik_pipeline.etl import runs
+from src.tuik_pipeline.etl.normalizer import MANIFEST_NAME
 
 logger = get_logger(__name__)
 
+# Columns the loader needs; everything else in the normalized CSV is never read.
+# The 'sheet' tag is not stored: each sheet of a multi-sheet workbook is its own CSV,
+# so its rows are told apart by source_file ('<title>__<sheet>.csv').
+LOADER_COLUMNS = {"year", "threshold", "metric", "education", "value", "dataset_id", "source_file"}
+DEFAULT_CHUNKSIZE = 50_000
+
+# Bump whenever a change alters what gets inserted, so the ledger reloads affected files
+LOADER_VERSION = "1"
+
 def iter_csv_files(root: Path):
+    """
+    The CSVs to load under root: the ones its manifest.csv lists when it is a keyword
+    directory written by the normalizer, otherwise every normalized CSV below it.
+    """
+    manifest = root / MANIFEST_NAME
+    if manifest.is_file():
+        with open(manifest, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield Path(row["csv_path"])
+        return
     for p in root.rglob("*.csv"):
-        if p.is_file():
+        if p.is_file() and p.name != MANIFEST_NAME and ".tmp" not in p.relative_to(root).parts:
             yield p
 
-def guess_dataset_id(db: Session, source_file: str) -> int | None:
+def text_values(df: pd.DataFrame, col: str, default: str | None = None) -> list[str | None]:
+    """
+    Column values as strings (missing/empty values -> default), one per row.
+    """
+    if col not in df.columns:
+        return [default] * len(df)
+    return [str(v) if pd.notnull(v) and v else default for v in df[col]]
+
+def guess_dataset_id(resolver: DatasetResolver, source_file: str, csv_path: Path) -> int | None:
     """
     Fallback method to match file to a dataset ID if columns are missing.
-    Matches using Group Name (folder) and Title (filename).
-    """
-    p = Path(source_file)
-    title = p.stem.replace("_", " ").strip().lower()
-    group_name = p.parent.name.replace("_", " ").strip().lower()
-
-    stmt = (
-        select(Dataset.id)
-        .where(Dataset.group_name.ilike(f"%{group_name}%"))
-        .where(Dataset.title.ilike(f"%{title[:40]}%"))
-        .limit(1)
-    )
-    row = db.execute(stmt).first()
-    return row[0] if row else None
-
-def run_loader_pipeline(root_path_str: str, limit: int = 0):
+    Matches using Group Name (folder) and Title (filename), via the in-memory resolver index.
+    """
+    return resolver.resolve(source_file) or resolver.resolve(str(csv_path))
+
+def iter_frames(csv_path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Yields the file in fixed-size chunks (or whole, when chunksize <= 0).
+    Year is read as text so every chunk validates it the same way.
+    """
+    kwargs = dict(usecols=lambda c: c in LOADER_COLUMNS, dtype={"year": str})
+    if chunksize > 0:
+        with pd.read_csv(csv_path, chunksize=chunksize, **kwargs) as reader:
+            yield from reader
+    else:
+        yield pd.read_csv(csv_path, **kwargs)
+
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Validates and cleans one chunk: keeps rows with a 4-digit year,
+    tidies thresholds and coerces values to numbers.
+    """
+    # Check year format
+    year = df["year"].astype(str).str.strip()
+    df = df[year.str.match(r"^(19|20)\d{2}$", na=False)].copy()
+    df["year"] = year.loc[df.index].astype(int)
+
+    if "threshold" in df.columns:
+        t = df["threshold"]
+        df["threshold"] = t.where(t.isna(), t.astype(str).str.replace(r"\s+", " ", regex=True).str.strip())
+
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    return df
+
+def build_rows(df: pd.DataFrame, dims: DimensionCache, dataset_id: int, source_file_id: int) -> list[dict]:
+    """
+    Resolves dictionary-encoded keys in bulk and returns insert parameters for one chunk.
+    """
+    metrics = text_values(df, "metric", default="unknown")
+    thresholds = text_values(df, "threshold")
+    educations = text_values(df, "education")
+
+    metric_ids = dims.metric_ids(metrics)
+    threshold_ids = dims.dimension_ids("threshold", thresholds)
+    education_ids = dims.dimension_ids("education", educations)
+
+    return [
+        {
+            "dataset_id": dataset_id,
+            "year": year,
+            "threshold_id": threshold_ids.get(t),
+            "metric_id": metric_ids[m],
+            "education_id": education_ids.get(e),
+            "value": None if pd.isna(v) else v,
+            "source_file_id": source_file_id,
+        }
+        for year, m, t, e, v in zip(df["year"].tolist(), metrics, thresholds, educations, df["value"].tolist())
+    ]
+
+def peek_dataset_id(csv_path: Path, get_resolver: Callable[[], DatasetResolver]) -> int:
+    """
+    Resolves a file's dataset_id from its first row only (or via the resolver).
+    """
+    head = pd.read_csv(csv_path, nrows=1, usecols=lambda c: c in ("dataset_id", "source_file"))
+    source_file = head["source_file"].iloc[0] if "source_file" in head.columns and not head.empty else str(csv_path)
+
+    if "dataset_id" in head.columns and not head.empty and pd.notnull(head["dataset_id"].iloc[0]):
+        dataset_id = int(head["dataset_id"].iloc[0])
+    else:
+        dataset_id = guess_dataset_id(get_resolver(), source_file, csv_path)
+
+    if not dataset_id:
+        raise ValueError(f"Could not resolve dataset_id for: {source_file}")
+    return dataset_id
+
+def load_csv_file(
+    db: Session,
+    csv_path: Path,
+    dataset_id: int,
+    dims: DimensionCache,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    replace: bool = False,
+    replace_file: bool = False,
+) -> int:
+    """
+    Streams one normalized CSV into observation_facts inside the caller's transaction.
+    Only one chunk is held in memory at a time. Returns the inserted row count.
+    replace drops the whole dataset first, replace_file only rows previously loaded from this file.
+    """
+    source_file_id = dims.source_file_id(str(csv_path))
+    inserted = 0
+
+    if replace:
+        replace_dataset_rows(db, dataset_id)
+    elif replace_file:
+        db.execute(
+            delete(Observation)
+            .where(Observation.dataset_id == dataset_id)
+            .where(Observation.source_file_id == source_file_id)
+        )
+
+    for chunk in iter_frames(csv_path, chunksize):
+        if "year" not in chunk.columns:
+            raise ValueError("CSV missing 'year' column")
+
+        # Clean and Validations
+        df = prepare_frame(chunk)
+        if df.empty:
+            continue
+
+        rows = build_rows(df, dims, dataset_id, source_file_id)
+        db.execute(insert(Observation), rows)
+        inserted += len(rows)
+
+    return inserted
+
+def drop_superseded_files(
+    db: Session, dataset_id: int, items: list[tuple[int, Path]], dims: DimensionCache
+) -> list[tuple[Path, int]]:
+    """
+    Deletes the dataset's rows loaded from CSVs that are gone from its directory, e.g. a
+    '<title>.csv' the normalizer replaced with per-sheet files, along with their ledger rows.
+    Returns (path, deleted_rows) per superseded file.
+    """
+    dropped = []
+    for directory in {csv_path.parent for _, csv_path in items}:
+        prefix = str(directory) + os.sep
+        artifacts = db.scalars(
+            select(Artifact)
+            .where(Artifact.stage == "load")
+            .where(Artifact.input_path.startswith(prefix, autoescape=True))
+        ).all()
+        for artifact in artifacts:
+            path = Path(artifact.input_path)
+            if path.parent != directory or path.exists():
+                continue
+            removed = db.execute(
+                delete(Observation)
+                .where(Observation.dataset_id == dataset_id)
+                .where(Observation.source_file_id == dims.source_file_id(artifact.input_path))
+            ).rowcount
+            db.delete(artifact)
+            dropped.append((path, removed))
+            logger.info(f"Dropped {removed} rows of superseded {path.name} (dataset {dataset_id})")
+    db.commit()
+    return dropped
+
+def load_dataset_files(
+    dataset_id: int,
+    items: list[tuple[int, Path]],
+    dims: DimensionCache,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    replace: bool = False,
+    force: bool = False,
+) -> list[tuple[Path, str, int]]:
+    """
+    Loads all files of one dataset over a dedicated pooled connection, one transaction
+    per file. Files unchanged since their last successful load (per the artifact ledger)
+    are skipped; with replace=True the dataset is only skipped if all of its files are.
+    Rows of superseded CSVs (see drop_superseded_files) are deleted first.
+    Returns (path, "ok" | "skip" | "fail", inserted_rows) per file, plus
+    (path, "superseded", deleted_rows) per superseded file.
+    """
+    results = []
+    with SessionLocal() as db:
+        results.extend((path, "superseded", removed) for path, removed in drop_superseded_files(db, dataset_id, items, dims))
+
+        plan = []
+        for i, csv_path in items:
+            sha = file_sha256(csv_path)
+            artifact = get_artifact(db, "load", csv_path)
+            fresh = not force and is_fresh(artifact, sha, LOADER_VERSION, {}, "loaded")
+            was_loaded = artifact is not None and artifact.status == "loaded"
+            plan.append((i, csv_path, sha, fresh, was_loaded))
+
+        # Replacing the dataset drops rows of unchanged files too, so they must be reloaded
+        reload_all = replace and not all(fresh for *_, fresh, _ in plan)
+        pending_replace = reload_all
+
+        for i, csv_path, sha, fresh, was_loaded in plan:
+            if fresh and not reload_all:
+                results.append((csv_path, "skip", 0))
+                logger.info(f"[{i:04d}] SKIP (unchanged) -> {csv_path.name}")
+                continue
+            item_started = time.perf_counter()
+            try:
+                inserted = load_csv_file(
+                    db, csv_path, dataset_id, dims, chunksize=chunksize,
+                    replace=pending_replace, replace_file=was_loaded,
+                )
+                record_artifact(db, "load", csv_path, sha, LOADER_VERSION, {}, "loaded")
+                db.commit()
+                pending_replace = False
+                results.append((csv_path, "ok", inserted))
+                logger.info(f"[{i:04d}] OK -> {csv_path.name} (rows={inserted})")
+            except Exception as e:
+                db.rollback()
+                results.append((csv_path, "fail", 0))
+                logger.error(f"Failed to load {csv_path.name}: {e}")
+            finally:
+                record_item(str(csv_path), time.perf_counter() - item_started, f"dataset={dataset_id} {results[-1][1]} rows={results[-1][2]}")
+    return results
+
+def run_loader_pipeline(
+    root_path_str: str,
+    limit: int = 0,
+    replace: bool = False,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: int = 1,
+    force: bool = False,
+    run_id: int | None = None,
+    resume: bool = False,
+):
+    """
+    Loads normalized CSVs into observation_facts, one transaction per file.
+    Files are streamed in `chunksize` rows (0 reads each file whole).
+    Files are grouped by dataset and up to `workers` datasets load concurrently,
+    each over its own pooled connection.
+    With replace=True, each dataset's existing rows are dropped once per run before
+    its first file is inserted (a partition TRUNCATE under list partitioning).
+    Files unchanged since their last load are skipped unless force=True.
+    root is a keyword directory (its manifest.csv lists the shared dataset CSVs) or any
+    directory of normalized CSVs.
+    With run_id, dataset states are recorded on that pipeline run and the run is finished;
+    datasets the run already loaded are skipped (unless force=True without resume).
+    """
     root = Path(root_path_str)
-    files = list(iter_csv_files(root))
+    # Keywords sharing a dataset list the same CSVs; each is loaded once
+    files = list(dict.fromkeys(iter_csv_files(root)))
     
     if limit > 0:
         files = files[:limit]
 
-    logger.info(f"Loading files from root={root}, count={len(files)}")
+    workers = max(1, workers)
+    logger.info(f"Loading files from root={root}, count={len(files)}, chunksize={chunksize}, workers={workers}")
+
+    if workers > settings.db_pool_size + settings.db_max_overflow:
+        logger.warning(
+            f"workers={workers} exceeds the connection pool "
+            f"(DB_POOL_SIZE + DB_MAX_OVERFLOW = {settings.db_pool_size + settings.db_max_overflow})"
+        )
 
     db = SessionLocal()
+    dims = DimensionCache()
+    resolver: DatasetResolver | None = None
+
+    def get_resolver() -> DatasetResolver:
+        nonlocal resolver
+        if resolver is None:
+            resolver = DatasetResolver.from_db(db)
+        return resolver
+
     try:
+        started = time.perf_counter()
         ok_count = 0
         fail_count = 0
+        skip_count = 0
         total_inserted = 0
 
+        # Plan: group files by dataset so each dataset is handled by exactly one worker
+        groups: dict[int, list[tuple[int, Path]]] = {}
         for i, csv_path in enumerate(files, start=1):
             try:
-                df = pd.read_csv(csv_path)
-
-                if "year" not in df.columns:
-                    raise ValueError("CSV missing 'year' column")
-
-                # Resolve dataset_id
-                source_file = df["source_file"].iloc[0] if "source_file" in df.columns else str(csv_path)
-                
-                if "dataset_id" in df.columns and pd.notnull(df["dataset_id"].iloc[0]):
-                    dataset_id = int(df["dataset_id"].iloc[0])
-                else:
-                    dataset_id = guess_dataset_id(db, source_file)
-
-                if not dataset_id:
-                    raise ValueError(f"Could not resolve dataset_id for: {source_file}")
-
-                # Clean and Validations
-                df = df.where(pd.notnull(df), None)
-                
-                # Check year format
-                df["year"] = df["year"].astype(str).str.strip()
-                df = df[df["year"].str.match(r"^(19|20)\d{2}$", na=False)]
-                df["year"] = df["year"].astype(int)
-
-                if "threshold" in df.columns:
-                    df["threshold"] = df["threshold"].astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
-                
-                df["value"] = pd.to_numeric(df["value"], errors="coerce")
-
-                rows_to_insert = []
-                for _, r in df.iterrows():
-                    rows_to_insert.append(
-                        Observation(
-                            dataset_id=dataset_id,
-                            year=int(r["year"]), # Already vetted above
-                            threshold=str(r.get("threshold")) if r.get("threshold") else None,
-                            metric=str(r.get("metric")) if r.get("metric") else "unknown",
-                            education=str(r.get("education")) if r.get("education") else None,
-                            value=r.get("value"),
-                            source_file=str(csv_path),
-                        )
-                    )
-
-                if rows_to_insert:
-                    db.add_all(rows_to_insert)
-                    db.commit()
-                    total_inserted += len(rows_to_insert)
-
-                ok_count += 1
-                logger.info(f"[{i:04d}] OK -> {csv_path.name} (rows={len(rows_to_insert)})")
-
+                groups.setdefault(peek_dataset_id(csv_path, get_resolver), []).append((i, csv_path))
             except Exception as e:
-                db.rollback()
                 fail_count += 1
                 logger.error(f"Failed to load {csv_path.name}: {e}")
 
-        logger.info(f"Loader Summary: OK={ok_count} FAIL={fail_count} INSERTED={total_inserted}")
+        # A dataset is loaded once per run, even when several keywords' loads list it
+        if run_id and (resume or not force):
+            loaded = {}
+            for (kw, ds_id), item in runs.item_states(run_id).items():
+                loaded[ds_id] = loaded.get(ds_id, True) and item.state == "loaded"
+            for ds_id in [d for d in groups if loaded.get(d)]:
+                skip_count += len(groups.pop(ds_id))
+                logger.info(f"SKIP dataset {ds_id} (run {run_id}: loaded)")
+
+        # Create partitions up front so workers never run DDL against each other's loads
+        with engine.begin() as conn:
+            ensure_partitions(conn, dataset_ids=groups.keys())
+
+        touched: set[int] = set()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(load_dataset_files, ds_id, items, dims, chunksize, replace, force): ds_id
+                for ds_id, items in groups.items()
+            }
+            for fut in as_completed(futures):
+                results = fut.result()
+                if run_id:
+                    failed = any(status == "fail" for _, status, _ in results)
+                    runs.set_item_state(run_id, futures[fut], "failed" if failed else "loaded",
+                                        error="load failed" if failed else None)
+                for csv_path, status, inserted in results:
+                    if status == "superseded":
+                        touched.add(futures[fut])
+                        continue
+                    if status == "skip":
+                        skip_count += 1
+                        continue
+                    if status == "fail":
+                        fail_count += 1
+                        continue
+                    ok_count += 1
+                    total_inserted += inserted
+                    touched.add(futures[fut])
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Loader Summary: OK={ok_count} SKIP={skip_count} FAIL={fail_count} INSERTED={total_inserted} "
+            f"DATASETS={len(groups)} ELAPSED={elapsed:.1f}s ({total_inserted / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+        if resolver and resolver.ambiguous:
+            logger.warning(f"Ambiguous dataset matches: {len(resolver.ambiguous)} file(s) skipped")
+
+        # Only datasets touched by this run are re-aggregated and republished
+        refresh_rollups(db, touched)
+        publish_datasets(touched)
+
+        if run_id:
+            runs.finish_run(run_id, "done" if fail_count == 0 else "failed")
 
     finally:
         db.close()
@@ -1,12 +1,33 @@
 import csv
+import json
+import os
 import re
+import shutil
+import tempfile
+import time
+import multiprocessing
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
 
 from src.tuik_pipeline.core.logging import get_logger
+from src.tuik_pipeline.core.database import SessionLocal, advisory_lock
+from src.tuik_pipeline.etl.ledger import file_sha256, get_artifact, is_fresh, record_artifact
+from src.tuik_pipeline.etl import runs
+from src.tuik_pipeline.core.profiling import profile_worker, record_item, worker_profile_dir
+from src.tuik_pipeline.core import raw_store
 
 logger = get_logger(__name__)
 
+# Bump whenever a change alters normalized output, so the ledger re-runs affected files
+NORMALIZER_VERSION = "3"
+
+# Each dataset is normalized once into <out>/_datasets/<dataset_id>/, however many keywords
+# matched it; <out>/<keyword>/manifest.csv lists the CSVs that keyword's load reads
+DATASETS_DIRNAME = "_datasets"
+MANIFEST_NAME = "manifest.csv"
+
 def safe_dirname(text: str, max_len: int = 80) -> str:
     text = (text or "").strip().lower()
     text = re.sub(r"[\\/:*?\"<>|]+", "", text)
@@ -23,7 +44,7 @@ def safe_filename(text: str, max_len: int = 200) -> str:
     return text or "untitled"
 
 def is_excel(path: Path) -> bool:
-    return path.suffix.lower() in (".xls", ".xlsx")
+    return raw_store.is_excel(path)
 
 def flatten_columns(cols) -> list[str]:
     """
@@ -107,12 +128,126 @@ def melt_to_observation_format(df: pd.DataFrame) -> pd.DataFrame:
     
     return long_df[cols]
 
+def dataset_output_dir(out_root: Path, dataset_id: int) -> Path:
+    return out_root / DATASETS_DIRNAME / str(int(dataset_id))
+
+def write_keyword_manifests(out_root: Path, outputs: dict[str, dict[int, list[str]]]) -> None:
+    """
+    Writes <out_root>/<keyword>/manifest.csv (dataset_id, csv_path) for each keyword.
+    """
+    for keyword, datasets in outputs.items():
+        kw_dir = out_root / safe_dirname(keyword)
+        kw_dir.mkdir(parents=True, exist_ok=True)
+        tmp = kw_dir / (MANIFEST_NAME + ".tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["dataset_id", "csv_path"])
+            for dataset_id, paths in sorted(datasets.items()):
+                writer.writerows([dataset_id, p] for p in paths)
+        os.replace(tmp, kw_dir / MANIFEST_NAME)
+        logger.info(f"Manifest: {sum(map(len, datasets.values()))} CSV(s) -> {kw_dir / MANIFEST_NAME}")
+
+def open_workbook(content: bytes, suffix: str) -> pd.ExcelFile:
+    """
+    Opens workbook bytes for sheet-by-sheet parsing. Legacy .xls goes through xlrd with
+    on_demand, so listing the sheets or parsing one does not parse every other sheet.
+    """
+    if suffix == ".xls":
+        return pd.ExcelFile(BytesIO(content), engine="xlrd", engine_kwargs={"on_demand": True})
+    return pd.ExcelFile(BytesIO(content))
+
+def contiguous_groups(items: list, n: int) -> list[list]:
+    """
+    Splits items into at most n contiguous, nearly equal groups.
+    """
+    n = max(1, min(n, len(items)))
+    size, extra = divmod(len(items), n)
+    groups, start = [], 0
+    for k in range(n):
+        end = start + size + (1 if k < extra else 0)
+        groups.append(items[start:end])
+        start = end
+    return groups
+
+def normalize_sheet(sheet_name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalizes a single sheet into observation format, tagged with its sheet name.
+    """
+    df = normalize_dataframe(df)
+    long_df = melt_to_observation_format(df)
+    long_df["sheet"] = sheet_name
+    return long_df
+
+def sheet_output_path(out_dir: Path, title: str, sheet_name: str, multi_sheet: bool) -> Path:
+    """
+    Single-sheet workbooks keep the plain '<title>.csv' name,
+    multi-sheet workbooks get one '<title>__<sheet>.csv' per sheet.
+    """
+    if not multi_sheet:
+        return out_dir / (safe_filename(title) + ".csv")
+    return out_dir / (safe_filename(title) + "__" + safe_filename(sheet_name, max_len=60) + ".csv")
+
+def normalize_workbook_sheet(
+    xls: pd.ExcelFile,
+    sheet_name: str,
+    header_rows: list[int],
+    out_csv: str,
+    metadata: dict,
+) -> str | None:
+    """
+    Parses one sheet of an open workbook, normalizes it and writes it to out_csv.
+    Returns out_csv, or None when the sheet cannot be parsed or is empty.
+    """
+    source = Path(metadata["source_file"]).name
+    try:
+        df = xls.parse(sheet_name=sheet_name, header=header_rows)
+    except Exception as e:
+        logger.warning(f"Skipping sheet '{sheet_name}' in {source}: {e}")
+        return None
+
+    long_df = normalize_sheet(sheet_name, df)
+    if long_df.empty:
+        logger.debug(f"Empty sheet '{sheet_name}' in {source}")
+        return None
+    for column, value in metadata.items():
+        long_df[column] = value
+    long_df.to_csv(out_csv, index=False)
+    return out_csv
+
+def normalize_sheet_group(
+    content: bytes,
+    suffix: str,
+    sheets: list[tuple[str, str]],
+    header_rows: list[int],
+    metadata: dict,
+    profile_dir: str | None = None,
+) -> list[str | None]:
+    """
+    Runs in a worker process: opens the workbook once and normalizes its group of
+    (sheet_name, out_csv) pairs. Returns the normalize_workbook_sheet result per sheet.
+    With profile_dir (from a profiled stage) the task is profiled into it.
+    """
+    with profile_worker(profile_dir), open_workbook(content, suffix) as xls:
+        return [normalize_workbook_sheet(xls, name, header_rows, out_csv, metadata) for name, out_csv in sheets]
+
 def run_normalization_pipeline(
     manifest_path_str: str, 
     out_root_str: str = "normalized",
     header_rows: list[int] = [0, 1, 2],
-    limit: int = 0
+    limit: int = 0,
+    workers: int = 4,
+    force: bool = False,
+    run_id: int | None = None,
+    resume: bool = False
 ):
+    """
+    Normalizes every workbook in the manifest into its dataset's shared directory and
+    writes the per-keyword manifests listing the resulting CSVs. Workbooks whose bytes,
+    header settings and NORMALIZER_VERSION match a successful ledger entry are skipped
+    unless force=True.
+    Item states are recorded on the pipeline run (run_id, else the manifest's run_id column);
+    with resume=True items the run already normalized are skipped.
+    """
     manifest_path = Path(manifest_path_str)
     out_root = Path(out_root_str)
 
@@ -131,51 +266,153 @@ def run_normalization_pipeline(
 
     logger.info(f"Processing {len(rows)} items from manifest: {manifest_path}")
 
+    run_id = run_id or next((int(r["run_id"]) for r in rows if r.get("run_id")), None)
+    items = runs.item_states(run_id) if run_id and resume else {}
+
     ok_count = 0
     fail_count = 0
-
-    for i, r in enumerate(rows, start=1):
-        try:
-            dataset_id = int(r["dataset_id"])
+    skip_count = 0
+    params = {"header_rows": list(header_rows)}
+    # keyword -> dataset_id -> CSVs, for the keyword manifests
+    outputs: dict[str, dict[int, list[str]]] = {}
+
+    # Sheets are parsed and normalized in worker processes (both steps hold the GIL).
+    # Spawned workers do not inherit the parent's database connections.
+    pool = ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+    with SessionLocal() as db, pool:
+        for i, r in enumerate(rows, start=1):
+            sha = None
+            scope = ""
+            dataset_id = None
             keyword = r.get("keyword") or ""
-            group_name = r.get("group_name") or ""
-            title = r.get("title") or ""
-            saved_path = Path(r["saved_path"])
-
-            if not saved_path.exists():
-                logger.warning(f"File missing: {saved_path}")
-                continue
-
-            if not is_excel(saved_path):
-                logger.debug(f"Skipping non-excel: {saved_path.name}")
-                continue
-
-            # Output paths
-            kw_dir = out_root / safe_dirname(keyword)
-            # Normalized Group Directory
-            grp_dir = kw_dir / safe_dirname(group_name)
-            grp_dir.mkdir(parents=True, exist_ok=True)
-            
-            out_csv = grp_dir / (safe_filename(title) + ".csv")
-
-            # Read Excel
-            df = pd.read_excel(saved_path, header=header_rows)
-            df = normalize_dataframe(df)
-            long_df = melt_to_observation_format(df)
-
-            # Enriched metadata
-            long_df["dataset_id"] = dataset_id
-            long_df["keyword"] = keyword
-            long_df["group_name"] = group_name
-            long_df["title"] = title
-            long_df["source_file"] = str(saved_path)
-
-            long_df.to_csv(out_csv, index=False)
-            ok_count += 1
-            logger.info(f"[{i:04d}] OK -> {out_csv}")
-
-        except Exception as e:
-            fail_count += 1
-            logger.error(f"Failed to normalize item {i}: {e}")
-
-    logger.info(f"Normalization Complete. OK={ok_count} FAIL={fail_count}")
+            item_started = time.perf_counter()
+            try:
+                dataset_id = int(r["dataset_id"])
+                group_name = r.get("group_name") or ""
+                title = r.get("title") or ""
+                saved_path = Path(r["saved_path"])
+
+                ds_dir = dataset_output_dir(out_root, dataset_id)
+                # The ledger is kept per output dir, so another --out root normalizes again
+                scope = str(ds_dir)
+                listed = outputs.setdefault(keyword, {})
+
+                item = items.get((keyword, dataset_id))
+                if item and runs.reached(item.state, "normalized"):
+                    skip_count += 1
+                    logger.info(f"[{i:04d}] SKIP (run {run_id}: {item.state}) -> {saved_path.name}")
+                    artifact = get_artifact(db, "normalize", saved_path, scope)
+                    if artifact is not None and artifact.status == "normalized":
+                        listed[dataset_id] = json.loads(artifact.output_paths)
+                    continue
+
+                if not saved_path.exists():
+                    logger.warning(f"File missing: {saved_path}")
+                    continue
+
+                if not is_excel(saved_path):
+                    logger.debug(f"Skipping non-excel: {saved_path.name}")
+                    continue
+
+                # Concurrent job workers may share a dataset; the second one waits and then skips
+                with advisory_lock(f"normalize:{ds_dir}"):
+                    sha = raw_store.blob_sha256(saved_path) or file_sha256(saved_path)
+                    artifact = get_artifact(db, "normalize", saved_path, scope)
+                    if not force and is_fresh(artifact, sha, NORMALIZER_VERSION, params, "normalized"):
+                        skip_count += 1
+                        listed[dataset_id] = json.loads(artifact.output_paths)
+                        logger.info(f"[{i:04d}] SKIP (unchanged) -> {saved_path.name}")
+                        if run_id:
+                            runs.set_item_state(run_id, dataset_id, "normalized", keyword=keyword)
+                        continue
+
+                    ds_dir.mkdir(parents=True, exist_ok=True)
+
+                    # Read (and decompress) once; the same bytes serve every sheet
+                    content = raw_store.read_bytes(saved_path)
+                    suffix = raw_store.raw_suffix(saved_path)
+                    metadata = {
+                        "dataset_id": dataset_id,
+                        "group_name": group_name,
+                        "title": title,
+                        "source_file": str(saved_path),
+                    }
+
+                    # Sheets are written to a private temp dir and moved into place only
+                    # once the whole workbook succeeded, so a failure leaves no partial CSVs
+                    tmp_root = out_root / ".tmp"
+                    tmp_root.mkdir(parents=True, exist_ok=True)
+                    tmp_dir = Path(tempfile.mkdtemp(prefix=f"{dataset_id}-", dir=tmp_root))
+                    try:
+                        with open_workbook(content, suffix) as xls:
+                            # File names follow the workbook's sheet list, not which sheets turn out parseable
+                            sheet_names = list(xls.sheet_names)
+                            if not sheet_names:
+                                raise ValueError("Workbook has no sheets")
+                            multi_sheet = len(sheet_names) > 1
+                            sheets = [
+                                (name, str(tmp_dir / sheet_output_path(ds_dir, title, name, multi_sheet).name))
+                                for name in sheet_names
+                            ]
+
+                            # One contiguous group of sheets per worker, each opening the
+                            # workbook once; a single group is parsed from this open
+                            groups = contiguous_groups(sheets, workers)
+                            if len(groups) == 1:
+                                staged = [
+                                    normalize_workbook_sheet(xls, name, header_rows, out_csv, metadata)
+                                    for name, out_csv in sheets
+                                ]
+                            else:
+                                futures = [
+                                    pool.submit(
+                                        normalize_sheet_group, content, suffix, group, header_rows, metadata,
+                                        worker_profile_dir(),
+                                    )
+                                    for group in groups
+                                ]
+                                staged = [out_csv for fut in futures for out_csv in fut.result()]
+
+                        if not any(staged):
+                            raise ValueError("All sheets were empty after normalization")
+
+                        written = []
+                        for tmp_csv in staged:
+                            if tmp_csv is None:
+                                continue
+                            out_csv = ds_dir / Path(tmp_csv).name
+                            os.replace(tmp_csv, out_csv)
+                            written.append(str(out_csv))
+                            logger.info(f"[{i:04d}] OK -> {out_csv}")
+                    finally:
+                        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+                    # CSVs of an earlier normalization that this one no longer writes, e.g.
+                    # '<title>.csv' after the workbook gained a sheet; the loader drops their rows
+                    for stale in set(ds_dir.glob("*.csv")) - {Path(p) for p in written}:
+                        stale.unlink()
+                        logger.info(f"[{i:04d}] Removed superseded {stale}")
+
+                    record_artifact(
+                        db, "normalize", saved_path, sha, NORMALIZER_VERSION, params, "normalized", written, scope
+                    )
+                    db.commit()
+                    listed[dataset_id] = written
+                    if run_id:
+                        runs.set_item_state(run_id, dataset_id, "normalized", keyword=keyword)
+                    ok_count += 1
+
+            except Exception as e:
+                db.rollback()
+                fail_count += 1
+                logger.error(f"Failed to normalize item {i}: {e}")
+                if sha:
+                    record_artifact(db, "normalize", saved_path, sha, NORMALIZER_VERSION, params, "failed", scope=scope)
+                    db.commit()
+                if run_id and dataset_id is not None:
+                    runs.set_item_state(run_id, dataset_id, "failed", keyword=keyword, error=str(e))
+            finally:
+                record_item(r.get("saved_path") or f"item {i}", time.perf_counter() - item_started, f"dataset={dataset_id}")
+
+    write_keyword_manifests(out_root, outputs)
+    logger.info(f"Normalization Complete. OK={ok_count} SKIP={skip_count} FAIL={fail_count}")
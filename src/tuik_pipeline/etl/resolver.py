@@ -0,0 +1,143 @@
+import re
+from collections import defaultdict
+from pathlib import Path
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.tuik_pipeline.core.logging import get_logger
+from src.tuik_pipeline.models.dataset import Dataset
+from src.tuik_pipeline.etl.downloader import normalize_title, STORE_DIRNAME
+from src.tuik_pipeline.etl.normalizer import safe_dirname, safe_filename
+
+logger = get_logger(__name__)
+
+TR_FOLD = str.maketrans("ğüşöçıİĞÜŞÖÇI", "gusociigusoci")
+
+# Suffixes added to file stems by the pipeline: "__<sheet>" (normalizer), "_<n>" (downloader)
+SHEET_SUFFIX = re.compile(r"__.*$")
+DEDUP_SUFFIX = re.compile(r"_\d+$")
+
+def fold(text: str) -> str:
+    """
+    Case/diacritic-insensitive form: Turkish letters folded to ASCII, punctuation to spaces.
+    """
+    text = (text or "").translate(TR_FOLD).lower()
+    text = re.sub(r"[^0-9a-z]+", " ", text)
+    return text.strip()
+
+def tokens(text: str) -> frozenset[str]:
+    return frozenset(t for t in fold(text).split() if len(t) > 1)
+
+def stem_variants(stem: str) -> list[str]:
+    out = [stem]
+    for pattern in (SHEET_SUFFIX, DEDUP_SUFFIX):
+        s = pattern.sub("", out[-1])
+        if s and s not in out:
+            out.append(s)
+    return out
+
+
+class DatasetResolver:
+    """
+    Maps downloaded/normalized file paths back to dataset ids.
+
+    Built once per run from (id, group_name, title, download_path). Exact keys are the
+    same directory/file names the pipeline generates; a token index on titles handles
+    everything else. Ambiguous matches resolve to None and are collected in `ambiguous`.
+    """
+
+    def __init__(self, rows: list[tuple[int, str | None, str, str | None]], min_score: float = 0.6):
+        self.min_score = min_score
+        self.ambiguous: list[tuple[str, list[int]]] = []
+
+        self.by_group_title: dict[tuple[str, str], list[int]] = defaultdict(list)
+        self.by_title: dict[str, list[int]] = defaultdict(list)
+        self.by_download_name: dict[str, list[int]] = defaultdict(list)
+        self.token_index: dict[str, set[int]] = defaultdict(set)
+        self.title_tokens: dict[int, frozenset[str]] = {}
+        self.group_keys: dict[int, set[str]] = {}
+
+        for ds_id, group_name, title, download_path in sorted(rows, key=lambda r: r[0]):
+            clean_title = normalize_title(title)
+            title_key = fold(safe_filename(clean_title))
+            group_keys = {
+                fold(safe_dirname(group_name or "")),
+                fold(safe_dirname(group_name or "unknown_group")),
+            }
+            for g in group_keys:
+                self.by_group_title[(g, title_key)].append(ds_id)
+            self.by_title[title_key].append(ds_id)
+            if download_path:
+                self.by_download_name[fold(Path(download_path).stem)].append(ds_id)
+
+            toks = tokens(clean_title)
+            self.title_tokens[ds_id] = toks
+            self.group_keys[ds_id] = group_keys
+            for t in toks:
+                self.token_index[t].add(ds_id)
+
+    @classmethod
+    def from_db(cls, db: Session, **kwargs) -> "DatasetResolver":
+        rows = db.execute(
+            select(Dataset.id, Dataset.group_name, Dataset.title, Dataset.download_path)
+        ).all()
+        logger.info(f"Dataset resolver index built: {len(rows)} datasets")
+        return cls([tuple(r) for r in rows], **kwargs)
+
+    def _pick(self, source_file: str, ids: list[int]) -> int | None:
+        unique = sorted(set(ids))
+        if len(unique) == 1:
+            return unique[0]
+        self.ambiguous.append((source_file, unique))
+        logger.warning(f"Ambiguous dataset match for {source_file}: candidates={unique}")
+        return None
+
+    def resolve(self, source_file: str) -> int | None:
+        p = Path(source_file)
+        group_key = fold(p.parent.name)
+
+        # 0) Files in the shared download store live under their dataset id
+        if p.parent.parent.name == STORE_DIRNAME and p.parent.name.isdigit():
+            ds_id = int(p.parent.name)
+            if ds_id in self.title_tokens:
+                return ds_id
+
+        # 1) Exact keys, trying the stem with pipeline suffixes stripped
+        for stem in stem_variants(p.stem):
+            title_key = fold(stem)
+            for index, key in (
+                (self.by_group_title, (group_key, title_key)),
+                (self.by_title, title_key),
+                (self.by_download_name, title_key),
+            ):
+                ids = index.get(key)
+                if ids:
+                    return self._pick(source_file, ids)
+
+        # 2) Fuzzy: Jaccard similarity over title tokens, same-group candidates win ties
+        query = tokens(stem_variants(p.stem)[-1])
+        if not query:
+            return None
+
+        candidates = set()
+        for t in query:
+            candidates |= self.token_index.get(t, set())
+
+        scored = []
+        for ds_id in candidates:
+            toks = self.title_tokens[ds_id]
+            score = len(query & toks) / len(query | toks)
+            if group_key in self.group_keys[ds_id]:
+                score += 0.1
+            scored.append((score, ds_id))
+
+        if not scored:
+            return None
+
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        best_score = scored[0][0]
+        if best_score < self.min_score:
+            return None
+
+        best = [ds_id for score, ds_id in scored if abs(score - best_score) < 1e-9]
+        return self._pick(source_file, best)
@@ -0,0 +1,58 @@
+from typing import Iterable
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.orm import Session
+
+from src.tuik_pipeline.core.logging import get_logger
+from src.tuik_pipeline.models.observation import Observation
+from src.tuik_pipeline.models.rollup import DatasetLatestYear, MetricYearly, EducationStats
+
+logger = get_logger(__name__)
+
+def refresh_rollups(db: Session, dataset_ids: Iterable[int]) -> None:
+    """
+    Recomputes the summary tables for the given datasets only, in one transaction.
+    """
+    ids = sorted(set(dataset_ids))
+    if not ids:
+        return
+
+    o = Observation
+    for model in (DatasetLatestYear, MetricYearly, EducationStats):
+        db.execute(delete(model).where(model.dataset_id.in_(ids)))
+
+    db.execute(
+        insert(DatasetLatestYear).from_select(
+            ["dataset_id", "first_year", "latest_year", "row_count"],
+            select(o.dataset_id, func.min(o.year), func.max(o.year), func.count())
+            .where(o.dataset_id.in_(ids))
+            .group_by(o.dataset_id),
+        )
+    )
+
+    db.execute(
+        insert(MetricYearly).from_select(
+            ["dataset_id", "metric_id", "year", "n", "avg_value", "min_value", "max_value"],
+            select(
+                o.dataset_id, o.metric_id, o.year, func.count(o.value),
+                func.avg(o.value), func.min(o.value), func.max(o.value),
+            )
+            .where(o.dataset_id.in_(ids))
+            .where(o.year.is_not(None))
+            .group_by(o.dataset_id, o.metric_id, o.year),
+        )
+    )
+
+    db.execute(
+        insert(EducationStats).from_select(
+            ["dataset_id", "metric_id", "education_id", "n", "avg_value", "min_value", "max_value"],
+            select(
+                o.dataset_id, o.metric_id, o.education_id, func.count(o.value),
+                func.avg(o.value), func.min(o.value), func.max(o.value),
+            )
+            .where(o.dataset_id.in_(ids))
+            .group_by(o.dataset_id, o.metric_id, o.education_id),
+        )
+    )
+
+    db.commit()
+    logger.info(f"Rollups refreshed for {len(ids)} dataset(s)")
@@ -0,0 +1,101 @@
+import json
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.tuik_pipeline.core.database import SessionLocal
+from src.tuik_pipeline.core.logging import get_logger
+from src.tuik_pipeline.models.pipeline_run import PipelineRun, RunItem
+
+logger = get_logger(__name__)
+
+# Item states in pipeline order; "failed" can be retried by resuming
+STATES = ["pending", "downloaded", "normalized", "loaded"]
+
+# Every helper commits on its own short session, so progress survives a crash of the stage.
+
+def reached(state: str | None, target: str) -> bool:
+    """
+    True if an item in `state` has already completed the `target` stage.
+    """
+    if state not in STATES:
+        return False
+    return STATES.index(state) >= STATES.index(target)
+
+def create_run(keywords: list[str]) -> int:
+    with SessionLocal() as db:
+        run = PipelineRun(keywords=json.dumps(keywords, ensure_ascii=False), status="running")
+        db.add(run)
+        db.commit()
+        logger.info(f"Started pipeline run id={run.id}")
+        return run.id
+
+def get_run(run_id: int) -> PipelineRun:
+    with SessionLocal() as db:
+        run = db.get(PipelineRun, run_id)
+        if not run:
+            raise ValueError(f"Pipeline run not found: {run_id}")
+        return run
+
+def run_keywords(run_id: int) -> list[str]:
+    return json.loads(get_run(run_id).keywords)
+
+def reopen_run(run_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(PipelineRun)
+            .where(PipelineRun.id == run_id)
+            .values(status="running", finished_at=None)
+        )
+        db.commit()
+    logger.info(f"Resuming pipeline run id={run_id}")
+
+def finish_run(run_id: int, status: str = "done") -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(PipelineRun)
+            .where(PipelineRun.id == run_id)
+            .values(status=status, finished_at=func.now())
+        )
+        db.commit()
+
+def register_items(run_id: int, items: list[tuple[str, int]]) -> None:
+    """
+    Adds (keyword, dataset_id) items as pending; existing items keep their state.
+    """
+    if not items:
+        return
+    with SessionLocal() as db:
+        db.execute(
+            pg_insert(RunItem)
+            .values([{"run_id": run_id, "keyword": kw, "dataset_id": ds_id, "state": "pending"} for kw, ds_id in items])
+            .on_conflict_do_nothing(constraint="uq_run_items_run_kw_ds")
+        )
+        db.commit()
+
+def item_states(run_id: int) -> dict[tuple[str, int], RunItem]:
+    with SessionLocal() as db:
+        rows = db.scalars(select(RunItem).where(RunItem.run_id == run_id)).all()
+        return {(r.keyword, r.dataset_id): r for r in rows}
+
+def set_item_state(
+    run_id: int,
+    dataset_id: int,
+    state: str,
+    keyword: str | None = None,
+    saved_path: str | None = None,
+    error: str | None = None,
+) -> None:
+    """
+    Updates one item (or, without keyword, every item of the dataset in the run).
+    """
+    values = {"state": state, "error": error}
+    if saved_path is not None:
+        values["saved_path"] = saved_path
+
+    stmt = update(RunItem).where(RunItem.run_id == run_id).where(RunItem.dataset_id == dataset_id)
+    if keyword is not None:
+        stmt = stmt.where(RunItem.keyword == keyword)
+
+    with SessionLocal() as db:
+        db.execute(stmt.values(**values))
+        db.commit()
@@ -0,0 +1,96 @@
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.tuik_pipeline.core.config import settings
+from src.tuik_pipeline.core.logging import get_logger
+from src.tuik_pipeline.models.job import Job
+from src.tuik_pipeline.etl.jobs import claim_job, finish_job, heartbeat, set_job_run, requeue_stale
+from src.tuik_pipeline.etl.downloader import run_downloader_pipeline, safe_dirname
+from src.tuik_pipeline.etl.normalizer import run_normalization_pipeline
+from src.tuik_pipeline.etl.loader import run_loader_pipeline
+
+logger = get_logger(__name__)
+
+@contextmanager
+def keep_alive(job_id: int, worker: str):
+    """
+    Refreshes the job's heartbeat every JOB_HEARTBEAT_SECONDS while the block runs.
+    """
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(settings.job_heartbeat_seconds):
+            try:
+                if not heartbeat(job_id, worker):
+                    logger.warning(f"[job {job_id}] lease lost; the job was requeued")
+            except Exception as e:
+                logger.error(f"[job {job_id}] heartbeat failed: {e}")
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+def run_job(job: Job) -> None:
+    """
+    Download -> normalize -> load for one keyword, tracked as a pipeline run.
+    """
+    kw = job.keyword
+    resume = job.run_id is not None
+    logger.info(f"[job {job.id}] START keyword={kw!r}" + (f" (resuming run {job.run_id})" if resume else ""))
+
+    run_id = None
+    try:
+        run_id = run_downloader_pipeline(keyword_arg=kw, skip_prompt=True, resume_run_id=job.run_id)
+        if run_id is None:
+            finish_job(job.id, "done", worker=job.worker)
+            logger.info(f"[job {job.id}] DONE (no datasets found)")
+            return
+        set_job_run(job.id, run_id)
+
+        manifest = Path("downloads") / safe_dirname(kw) / "manifest.csv"
+        run_normalization_pipeline(str(manifest), run_id=run_id, resume=resume)
+        run_loader_pipeline(str(Path("normalized") / safe_dirname(kw)), run_id=run_id, resume=resume)
+
+        finish_job(job.id, "done", run_id=run_id, worker=job.worker)
+        logger.info(f"[job {job.id}] DONE run={run_id}")
+    except Exception as e:
+        finish_job(job.id, "failed", run_id=run_id, error=str(e), worker=job.worker)
+        logger.error(f"[job {job.id}] FAILED: {e}")
+
+def work_loop(worker: str, stop: threading.Event, once: bool = False) -> None:
+    while not stop.is_set():
+        job = claim_job(worker)
+        if job is None:
+            if once:
+                return
+            requeue_stale()
+            stop.wait(settings.worker_poll_seconds)
+            continue
+        with keep_alive(job.id, worker):
+            run_job(job)
+
+def run_worker(workers: int = 2, once: bool = False) -> None:
+    """
+    Runs `workers` job loops until interrupted (or, with once=True, until the queue is empty).
+    """
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    requeue_stale()
+    logger.info(f"Worker {name} started with {workers} slot(s)")
+
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(work_loop, f"{name}/{i}", stop, once) for i in range(max(1, workers))]
+        try:
+            for fut in futures:
+                fut.result()
+        except KeyboardInterrupt:
+            logger.info("Stopping worker after the current jobs...")
+            stop.set()
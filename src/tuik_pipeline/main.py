@@ -1,20 +1,29 @@
 from fastapi import FastAPI
-from src.tuik_pipeline.core.database import engine, Base
-from src.tuik_pipeline.api.routes import health, datasets
+from src.tuik_pipeline.api.routes import health, categories, datasets, rollups, jobs, observations
 from src.tuik_pipeline.core.logging import setup_logging
+from src.tuik_pipeline.core.config import settings
+from src.tuik_pipeline.api.middleware import CompressionMiddleware, ETagMiddleware
+from src.tuik_pipeline.api.responses import FastJSONResponse
 
 def create_app() -> FastAPI:
     setup_logging()
     
-    app = FastAPI(title="TUIK Data Pipeline API")
+    app = FastAPI(title="TUIK Data Pipeline API", default_response_class=FastJSONResponse)
+
+    # The middleware added last is outermost: compression wraps the ETag layer, so tags hash
+    # the uncompressed body and carry the coding that compression will apply
+    app.add_middleware(ETagMiddleware, minimum_size=settings.api_compress_min_bytes)
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.api_compress_min_bytes)
     
     app.include_router(health.router, tags=["health"])
+    app.include_router(categories.router)
     app.include_router(datasets.router)
+    app.include_router(rollups.router)
+    app.include_router(observations.router)
+    app.include_router(jobs.router)
 
-    # Initialize DB (MVP style)
-    # Ideally should be done via migration scripts
-    Base.metadata.create_all(bind=engine)
-    
+    # Schema is managed by the explicit migration step (scripts.create_tables, run by
+    # run.sh / bot.sh), so importing the app does no DDL and needs no DB round trip.
     return app
 
 app = create_app()
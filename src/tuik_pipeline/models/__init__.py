@@ -1,5 +1,18 @@
 from .category import Category
 from .dataset import Dataset
+from .metric import Metric
+from .dimension import Dimension
+from .source_file import SourceFile
 from .observation import Observation
+from .rollup import DatasetLatestYear, MetricYearly, EducationStats
+from .artifact import Artifact
+from .pipeline_run import PipelineRun, RunItem
+from .job import Job
+from . import views  # noqa: F401  (registers the compatibility view DDL)
+from . import upgrades  # noqa: F401  (adds new columns to existing tables)
 
-__all__ = ["Category", "Dataset", "Observation"]
+__all__ = [
+    "Category", "Dataset", "Metric", "Dimension", "SourceFile", "Observation",
+    "DatasetLatestYear", "MetricYearly", "EducationStats", "Artifact",
+    "PipelineRun", "RunItem", "Job",
+]
@@ -0,0 +1,29 @@
+from sqlalchemy import Integer, String, Text, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from src.tuik_pipeline.core.database import Base
+
+class Artifact(Base):
+    """
+    Ledger of stage outputs keyed by input content, used to skip unchanged work.
+    """
+    __tablename__ = "artifacts"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    stage: Mapped[str] = mapped_column(String(32), nullable=False)  # "normalize" | "load"
+    input_path: Mapped[str] = mapped_column(Text, nullable=False)
+    # Distinguishes outputs of one input written to different places, e.g. the dataset
+    # directory under each normalizer --out root
+    scope: Mapped[str] = mapped_column(Text, nullable=False, default="", server_default="")
+    input_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    code_version: Mapped[str] = mapped_column(String(32), nullable=False)
+    params: Mapped[str] = mapped_column(Text, nullable=False, default="{}")  # JSON, e.g. header rows
+
+    output_paths: Mapped[str] = mapped_column(Text, nullable=False, default="[]")  # JSON list
+    status: Mapped[str] = mapped_column(String(16), nullable=False)  # "normalized" | "loaded" | "failed"
+
+    updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("uq_artifacts_stage_input_scope", "stage", "input_path", "scope", unique=True),
+    )
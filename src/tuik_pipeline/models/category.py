@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.tuik_pipeline.core.database import Base
 
@@ -6,10 +6,18 @@ class Category(Base):
     __tablename__ = "categories"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    tuik_key: Mapped[str] = mapped_column(String(200), unique=True, index=True)
+    tuik_key: Mapped[str] = mapped_column(String(200), unique=True, index=True)  # "<UstId>" or "<UstId>/<AltId>"
     name: Mapped[str] = mapped_column(String(300))
     parent_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("categories.id"), nullable=True)
 
+    # Materialized path of TUIK ids, e.g. "103/" for a top category and "103/1021/" for its child.
+    # "Everything under X" is `path LIKE 'X.path%'`, a range scan on the text_pattern_ops index.
+    path: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     parent = relationship("Category", remote_side=[id], backref="children")
+
+    __table_args__ = (
+        Index("ix_categories_path", "path", postgresql_ops={"path": "text_pattern_ops"}),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Text, Boolean, UniqueConstraint
+from sqlalchemy import String, Integer, Text, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from src.tuik_pipeline.core.database import Base
 
@@ -18,6 +18,13 @@ class Dataset(Base):
 
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Deepest category the dataset was found under, and a copy of that category's path
+    # so subtree queries hit one index on this table
+    category_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    category_path: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     __table_args__ = (
         UniqueConstraint(
             "ust_id",
@@ -25,4 +32,5 @@ class Dataset(Base):
             "title",
             name="uq_datasets_ust_path_title"
         ),
+        Index("ix_datasets_category_path", "category_path", postgresql_ops={"category_path": "text_pattern_ops"}),
     )
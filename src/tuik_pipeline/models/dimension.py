@@ -0,0 +1,16 @@
+from sqlalchemy import Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from src.tuik_pipeline.core.database import Base
+
+class Dimension(Base):
+    __tablename__ = "dimensions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    # e.g., "threshold" or "education"
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("kind", "value", name="uq_dimensions_kind_value"),
+    )
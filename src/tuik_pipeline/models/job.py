@@ -0,0 +1,35 @@
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from src.tuik_pipeline.core.database import Base
+
+class Job(Base):
+    """
+    Queued keyword refresh (download -> normalize -> load), claimed by workers
+    with SELECT ... FOR UPDATE SKIP LOCKED. A running job's worker refreshes
+    heartbeat_at; jobs whose heartbeat stops are requeued.
+    """
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    keyword: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # queued | running | done | failed
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    run_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("pipeline_runs.id", ondelete="SET NULL"), nullable=True)
+    worker: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_status_id", "status", "id"),
+        # At most one queued or running job per keyword
+        Index(
+            "uq_jobs_active_keyword", "keyword", unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
@@ -1,30 +1,53 @@
 from sqlalchemy import (
-    Column, Integer, BigInteger, String, ForeignKey,
-    Numeric, DateTime, func, Index, Text
+    Column, Integer, BigInteger, ForeignKey,
+    Numeric, DateTime, func, Index, event
 )
 from src.tuik_pipeline.core.database import Base
+from src.tuik_pipeline.core.partitions import (
+    PARTITION_CLAUSES, partitioning, partition_key, create_static_partitions
+)
+
+# Partitioned tables need the partition column in the primary key
+PARTITION_KEY = partition_key()
 
 
 class Observation(Base):
-    __tablename__ = "observations"
+    """
+    Fact table. Text dimensions are dictionary-encoded into lookup tables;
+    the 'observations' view (see models/views.py) exposes the old flat shape.
+    """
+    __tablename__ = "observation_facts"
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
 
     # Link to datasets table (reference only, cascading delete)
-    dataset_id = Column(Integer, ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False, index=True)
+    dataset_id = Column(
+        Integer, ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False,
+        primary_key=PARTITION_KEY == "dataset_id",
+    )
 
-    year = Column(Integer, nullable=True, index=True)
-    threshold = Column(Text, nullable=True)   # e.g., "%50"
-    metric = Column(Text, nullable=False, index=True)
-    education = Column(Text, nullable=True, index=True)
+    year = Column(Integer, nullable=PARTITION_KEY != "year", primary_key=PARTITION_KEY == "year")
+    threshold_id = Column(Integer, ForeignKey("dimensions.id"), nullable=True)   # e.g., "%50"
+    metric_id = Column(Integer, ForeignKey("metrics.id"), nullable=False, index=True)
+    education_id = Column(Integer, ForeignKey("dimensions.id"), nullable=True, index=True)
 
     value = Column(Numeric(18, 6), nullable=True)
 
-    source_file = Column(Text, nullable=True) # normalized csv path or excel path
+    source_file_id = Column(Integer, ForeignKey("source_files.id"), nullable=True) # normalized csv path or excel path
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     __table_args__ = (
         # Index to check uniqueness if needed
-        # Index("uq_obs", "dataset_id", "year", "threshold", "metric", "education", unique=True),
-        Index("ix_obs_dataset_year", "dataset_id", "year"),
+        # Index("uq_obs", "dataset_id", "year", "threshold_id", "metric_id", "education_id", unique=True),
+        # Not "ix_obs_dataset_year": the legacy 'observations' table still owns that name
+        # while create_all runs, before migrate_legacy_observations drops it
+        Index("ix_obs_facts_dataset_year", "dataset_id", "year"),
+        # BRIN keeps year-range scans cheap at a fraction of a B-tree's size
+        Index("brin_obs_year", "year", postgresql_using="brin"),
+        {"postgresql_partition_by": PARTITION_CLAUSES[partitioning()]} if PARTITION_KEY else {},
     )
+
+
+@event.listens_for(Observation.__table__, "after_create")
+def create_observation_partitions(target, conn, **kw) -> None:
+    create_static_partitions(conn)
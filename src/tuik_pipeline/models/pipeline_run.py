@@ -0,0 +1,32 @@
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+from src.tuik_pipeline.core.database import Base
+
+class PipelineRun(Base):
+    __tablename__ = "pipeline_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    keywords: Mapped[str] = mapped_column(Text, nullable=False)  # JSON list
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="running")  # running | done | failed
+
+    started_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+class RunItem(Base):
+    __tablename__ = "run_items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[int] = mapped_column(Integer, ForeignKey("pipeline_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    keyword: Mapped[str] = mapped_column(Text, nullable=False)
+    dataset_id: Mapped[int] = mapped_column(Integer, ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False)
+
+    # pending | downloaded | normalized | loaded | failed
+    state: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    saved_path: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "keyword", "dataset_id", name="uq_run_items_run_kw_ds"),
+    )
@@ -0,0 +1,44 @@
+from sqlalchemy import Integer, BigInteger, Numeric, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from src.tuik_pipeline.core.database import Base
+
+# Summary tables refreshed per dataset by etl/rollups.py after each load.
+
+class DatasetLatestYear(Base):
+    __tablename__ = "rollup_dataset_latest"
+
+    dataset_id: Mapped[int] = mapped_column(Integer, ForeignKey("datasets.id", ondelete="CASCADE"), primary_key=True)
+    first_year: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    latest_year: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    row_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    refreshed_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+class MetricYearly(Base):
+    __tablename__ = "rollup_metric_yearly"
+
+    dataset_id: Mapped[int] = mapped_column(Integer, ForeignKey("datasets.id", ondelete="CASCADE"), primary_key=True)
+    metric_id: Mapped[int] = mapped_column(Integer, ForeignKey("metrics.id"), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    n: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    avg_value = mapped_column(Numeric(18, 6), nullable=True)
+    min_value = mapped_column(Numeric(18, 6), nullable=True)
+    max_value = mapped_column(Numeric(18, 6), nullable=True)
+
+class EducationStats(Base):
+    __tablename__ = "rollup_education_stats"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    dataset_id: Mapped[int] = mapped_column(Integer, ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False)
+    metric_id: Mapped[int] = mapped_column(Integer, ForeignKey("metrics.id"), nullable=False)
+    education_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("dimensions.id"), nullable=True)
+
+    n: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    avg_value = mapped_column(Numeric(18, 6), nullable=True)
+    min_value = mapped_column(Numeric(18, 6), nullable=True)
+    max_value = mapped_column(Numeric(18, 6), nullable=True)
+
+    __table_args__ = (
+        Index("ix_rollup_edu_dataset_metric", "dataset_id", "metric_id"),
+    )
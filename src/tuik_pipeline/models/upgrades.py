@@ -0,0 +1,38 @@
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+
+from src.tuik_pipeline.core.database import Base
+
+# Columns added to tables that already exist in older databases. create_all only creates
+# missing tables, so these run on every create_tables; each statement is idempotent and
+# matches what the models declare for fresh databases.
+UPGRADE_SQL = [
+    # Fact tables created before the index was renamed
+    "DO $$ BEGIN "
+    "IF EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = current_schema() "
+    "AND tablename = 'observation_facts' AND indexname = 'ix_obs_dataset_year') THEN "
+    "ALTER INDEX ix_obs_dataset_year RENAME TO ix_obs_facts_dataset_year; "
+    "END IF; END $$",
+    "ALTER TABLE categories ADD COLUMN IF NOT EXISTS path TEXT",
+    "CREATE INDEX IF NOT EXISTS ix_categories_path ON categories (path text_pattern_ops)",
+    "ALTER TABLE datasets ADD COLUMN IF NOT EXISTS category_id INTEGER "
+    "REFERENCES categories(id) ON DELETE SET NULL",
+    "ALTER TABLE datasets ADD COLUMN IF NOT EXISTS category_path TEXT",
+    "CREATE INDEX IF NOT EXISTS ix_datasets_category_id ON datasets (category_id)",
+    "CREATE INDEX IF NOT EXISTS ix_datasets_category_path ON datasets (category_path text_pattern_ops)",
+    "ALTER TABLE artifacts ADD COLUMN IF NOT EXISTS scope TEXT NOT NULL DEFAULT ''",
+    "ALTER TABLE artifacts DROP CONSTRAINT IF EXISTS uq_artifacts_stage_input",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_artifacts_stage_input_scope ON artifacts (stage, input_path, scope)",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITH TIME ZONE",
+    # Older queues may hold duplicate active jobs for a keyword; keep the oldest
+    "UPDATE jobs j SET status = 'failed', error = 'Duplicate of an earlier active job', finished_at = now() "
+    "WHERE j.status IN ('queued', 'running') AND EXISTS ("
+    "SELECT 1 FROM jobs k WHERE k.keyword = j.keyword AND k.status IN ('queued', 'running') AND k.id < j.id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_jobs_active_keyword ON jobs (keyword) "
+    "WHERE status IN ('queued', 'running')",
+]
+
+@event.listens_for(Base.metadata, "after_create")
+def upgrade_existing_tables(target, conn: Connection, **kw) -> None:
+    for sql in UPGRADE_SQL:
+        conn.execute(text(sql))
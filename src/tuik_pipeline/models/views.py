@@ -0,0 +1,100 @@
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+
+from src.tuik_pipeline.core.database import Base
+from src.tuik_pipeline.core.partitions import ensure_partitions, partition_key
+from src.tuik_pipeline.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Flat, backwards compatible shape of the old 'observations' table.
+OBSERVATIONS_VIEW_SQL = """
+CREATE OR REPLACE VIEW observations AS
+SELECT
+    o.id,
+    o.dataset_id,
+    o.year,
+    td.value AS threshold,
+    m.name AS metric,
+    ed.value AS education,
+    o.value,
+    sf.path AS source_file,
+    o.created_at
+FROM observation_facts o
+JOIN metrics m ON m.id = o.metric_id
+LEFT JOIN dimensions td ON td.id = o.threshold_id
+LEFT JOIN dimensions ed ON ed.id = o.education_id
+LEFT JOIN source_files sf ON sf.id = o.source_file_id
+"""
+
+def has_legacy_observations_table(conn: Connection) -> bool:
+    row = conn.execute(text(
+        "SELECT table_type FROM information_schema.tables "
+        "WHERE table_schema = current_schema() AND table_name = 'observations'"
+    )).first()
+    return bool(row) and row[0] == "BASE TABLE"
+
+def migrate_legacy_observations(conn: Connection) -> None:
+    """
+    Moves rows from the old text-column 'observations' table into the
+    dictionary-encoded layout and drops the old table so the view can take its name.
+    """
+    logger.info("Migrating legacy 'observations' table to dictionary-encoded layout...")
+
+    conn.execute(text(
+        "INSERT INTO metrics (name) "
+        "SELECT DISTINCT metric FROM observations WHERE metric IS NOT NULL "
+        "ON CONFLICT (name) DO NOTHING"
+    ))
+    for kind in ("threshold", "education"):
+        conn.execute(text(
+            f"INSERT INTO dimensions (kind, value) "
+            f"SELECT DISTINCT '{kind}', {kind} FROM observations WHERE {kind} IS NOT NULL "
+            f"ON CONFLICT (kind, value) DO NOTHING"
+        ))
+    conn.execute(text(
+        "INSERT INTO source_files (path) "
+        "SELECT DISTINCT source_file FROM observations WHERE source_file IS NOT NULL "
+        "ON CONFLICT (path) DO NOTHING"
+    ))
+
+    dataset_ids = [r[0] for r in conn.execute(text("SELECT DISTINCT dataset_id FROM observations"))]
+    ensure_partitions(conn, dataset_ids=dataset_ids)
+
+    # Range partitioning puts year in the primary key, so rows without a year cannot be
+    # stored; they are kept aside in observations_unmigrated instead of aborting the migration
+    where = ""
+    if partition_key() == "year":
+        where = "WHERE o.year IS NOT NULL"
+        skipped = conn.execute(text("SELECT count(*) FROM observations WHERE year IS NULL")).scalar_one()
+        if skipped:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS observations_unmigrated AS "
+                "SELECT * FROM observations WHERE false"
+            ))
+            conn.execute(text("INSERT INTO observations_unmigrated SELECT * FROM observations WHERE year IS NULL"))
+            logger.warning(f"{skipped} legacy rows without a year copied to observations_unmigrated, not migrated")
+
+    conn.execute(text(f"""
+        INSERT INTO observation_facts
+            (id, dataset_id, year, threshold_id, metric_id, education_id, value, source_file_id, created_at)
+        SELECT
+            o.id, o.dataset_id, o.year, td.id, m.id, ed.id, o.value, sf.id, o.created_at
+        FROM observations o
+        JOIN metrics m ON m.name = o.metric
+        LEFT JOIN dimensions td ON td.kind = 'threshold' AND td.value = o.threshold
+        LEFT JOIN dimensions ed ON ed.kind = 'education' AND ed.value = o.education
+        LEFT JOIN source_files sf ON sf.path = o.source_file
+        {where}
+    """))
+    conn.execute(text(
+        "SELECT setval(pg_get_serial_sequence('observation_facts', 'id'), "
+        "COALESCE((SELECT MAX(id) FROM observation_facts), 1))"
+    ))
+    conn.execute(text("DROP TABLE observations"))
+
+@event.listens_for(Base.metadata, "after_create")
+def install_observation_views(target, conn: Connection, **kw) -> None:
+    if has_legacy_observations_table(conn):
+        migrate_legacy_observations(conn)
+    conn.execute(text(OBSERVATIONS_VIEW_SQL))
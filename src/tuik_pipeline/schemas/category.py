@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+class CategoryOut(BaseModel):
+    id: int
+    tuik_key: str
+    name: str
+    parent_id: int | None
+    path: str | None
+
+    class Config:
+        from_attributes = True
@@ -7,6 +7,7 @@ class DatasetOut(BaseModel):
     title: str
     publish_date_raw: str | None
     download_url: str
+    category_id: int | None = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,21 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+class JobIn(BaseModel):
+    keywords: list[str]
+
+class JobOut(BaseModel):
+    id: int
+    keyword: str
+    status: str
+    attempts: int
+    run_id: int | None
+    worker: str | None
+    error: str | None
+    created_at: datetime | None
+    started_at: datetime | None
+    finished_at: datetime | None
+    heartbeat_at: datetime | None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,27 @@
+from decimal import Decimal
+from pydantic import BaseModel
+
+class DatasetSummaryOut(BaseModel):
+    dataset_id: int
+    first_year: int | None
+    latest_year: int | None
+    row_count: int
+
+    class Config:
+        from_attributes = True
+
+class MetricYearOut(BaseModel):
+    metric: str
+    year: int
+    n: int
+    avg_value: Decimal | None
+    min_value: Decimal | None
+    max_value: Decimal | None
+
+class EducationStatsOut(BaseModel):
+    metric: str
+    education: str | None
+    n: int
+    avg_value: Decimal | None
+    min_value: Decimal | None
+    max_value: Decimal | None
@@ -14,16 +14,27 @@ class TuikClient:
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123 Safari/537.36",
         })
 
+    def category_url(self, parent_id: int, slug: str) -> str:
+        return f"{self.base_url}/Kategori/GetKategori?p={slug}-{parent_id}"
+
+    def get_category_page(self, parent_id: int, slug: str) -> str:
+        """
+        HTML of the category page, which lists its sub-categories (the AltIdler filters).
+        Also sets the session cookies, like prime_category_session.
+        """
+        r = self.session.get(self.category_url(parent_id, slug), timeout=self.timeout)
+        r.raise_for_status()
+        r.encoding = r.apparent_encoding or "utf-8"
+        return r.text
+
     def prime_category_session(self, parent_id: int, slug: str) -> str:
         """
         Simulates visiting the category page:
         /Kategori/GetKategori?p=<slug>-<parent_id>
         This GET request sets necessary AspNetCore.Session / Antiforgery cookies.
         """
-        url = f"{self.base_url}/Kategori/GetKategori?p={slug}-{parent_id}"
-        r = self.session.get(url, timeout=self.timeout)
-        r.raise_for_status()
-        return url  # Return to use as Referer
+        self.get_category_page(parent_id, slug)
+        return self.category_url(parent_id, slug)  # Return to use as Referer
 
     def get_statistical_tables(
         self,
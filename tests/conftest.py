@@ -0,0 +1,27 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests import the package as `src.tuik_pipeline`, like the scripts do
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Database tests run only against an explicitly given, throwaway database: they
+# create the schema there and truncate the tables they touch.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+else:
+    # Settings require a URL; nothing connects to it
+    os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://unused@localhost/unused")
+
+@pytest.fixture(scope="session")
+def database():
+    if not TEST_DATABASE_URL:
+        pytest.skip("set TEST_DATABASE_URL to a throwaway Postgres database to run database tests")
+    from src.tuik_pipeline.core.database import Base, engine
+    import src.tuik_pipeline.models  # noqa: F401  (registers every table)
+
+    Base.metadata.create_all(bind=engine)
+    return engine
@@ -0,0 +1,96 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.tuik_pipeline.etl.downloader import fetch_to_part, part_paths
+
+BODY = bytes(range(256)) * 64
+ETAG = '"v1"'
+
+@pytest.fixture
+def server():
+    """
+    Serves BODY with a strong ETag, honouring Range and If-Range; records request headers.
+    """
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(dict(self.headers))
+            range_header = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if range_header and (if_range is None or if_range == ETAG):
+                start = int(range_header.removeprefix("bytes=").rstrip("-"))
+                if start >= len(BODY):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(BODY)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                chunk = BODY[start:]
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(BODY) - 1}/{len(BODY)}")
+            else:
+                chunk = BODY
+                self.send_response(200)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", str(len(chunk)))
+            self.end_headers()
+            self.wfile.write(chunk)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/table.xls", seen
+    httpd.shutdown()
+    httpd.server_close()
+
+def partial(tmp_path, url, offset, etag=ETAG):
+    part, meta_path = part_paths(url, tmp_path)
+    part.write_bytes(BODY[:offset])
+    meta_path.write_text(json.dumps({
+        "url": url, "etag": etag, "last_modified": None, "total": len(BODY), "offset": offset,
+    }), encoding="utf-8")
+    return part, meta_path
+
+def test_resumes_from_persisted_offset(tmp_path, server):
+    url, seen = server
+    part, meta_path = partial(tmp_path, url, 5000)
+
+    fetch_to_part(url, part, meta_path)
+
+    assert part.read_bytes() == BODY
+    assert seen[-1]["Range"] == "bytes=5000-"
+    assert seen[-1]["If-Range"] == ETAG
+    assert json.loads(meta_path.read_text(encoding="utf-8"))["offset"] == len(BODY)
+
+def test_restarts_when_upstream_changed(tmp_path, server):
+    url, _ = server
+    part, meta_path = partial(tmp_path, url, 5000, etag='"v0"')
+    # Bytes that must not survive into the restarted file
+    part.write_bytes(b"\xff" * 5000)
+
+    fetch_to_part(url, part, meta_path)
+
+    assert part.read_bytes() == BODY
+
+def test_fresh_download_without_meta(tmp_path, server):
+    url, seen = server
+    part, meta_path = part_paths(url, tmp_path)
+
+    fetch_to_part(url, part, meta_path)
+
+    assert part.read_bytes() == BODY
+    assert "Range" not in seen[-1]
+
+def test_already_complete_part(tmp_path, server):
+    url, _ = server
+    part, meta_path = partial(tmp_path, url, len(BODY))
+
+    fetch_to_part(url, part, meta_path)
+
+    assert part.read_bytes() == BODY
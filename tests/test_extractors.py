@@ -0,0 +1,36 @@
+from src.tuik_pipeline.etl.extractors import parse_child_categories
+
+CATEGORY_PAGE = """
+<html><body>
+<ul class="alt-kategoriler">
+  <li>
+    <input type="checkbox" name="AltIdler[]" id="alt-1021" value="1021"><label for="alt-1021">Enerji</label>
+    <ul>
+      <li><input type="checkbox" name="AltIdler[]" id="alt-2001" value="2001"><label for="alt-2001">Elektrik</label></li>
+      <li>
+        <input type="checkbox" name="AltIdler[]" id="alt-2002" value="2002"><label for="alt-2002">Dogalgaz</label>
+        <ul><li><input type="checkbox" name="AltIdler[]" id="alt-3001" value="3001"><label for="alt-3001">Konut</label></li></ul>
+      </li>
+    </ul>
+  </li>
+  <li><input type="checkbox" name="AltIdler[]" id="alt-1022" value="1022"><label for="alt-1022">Cevre</label></li>
+  <li><input type="checkbox" name="AltIdler[]" id="alt-1022b" value="1022"><label for="alt-1022b">Cevre</label></li>
+</ul>
+<div class="filtre">
+  <input type="checkbox" name="Yillar[]" id="y-2023" value="2023"><label for="y-2023">2023</label>
+  <input type="checkbox" name="Donem" id="d-1" value="1"><label for="d-1">Yillik</label>
+</div>
+</body></html>
+"""
+
+def test_only_altidler_filters_are_categories():
+    ids = [cid for cid, _, _ in parse_child_categories(CATEGORY_PAGE)]
+    assert ids == [1021, 2001, 2002, 3001, 1022]
+
+def test_nested_filters_keep_their_parent():
+    parents = {cid: (name, parent) for cid, name, parent in parse_child_categories(CATEGORY_PAGE)}
+    assert parents[1021] == ("Enerji", None)
+    assert parents[2001] == ("Elektrik", 1021)
+    assert parents[2002] == ("Dogalgaz", 1021)
+    assert parents[3001] == ("Konut", 2002)
+    assert parents[1022] == ("Cevre", None)
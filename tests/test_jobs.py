@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import text
+
+from src.tuik_pipeline.etl.jobs import enqueue, claim_job, finish_job, heartbeat, requeue_stale
+from src.tuik_pipeline.core.database import SessionLocal
+from src.tuik_pipeline.models.job import Job
+
+@pytest.fixture(autouse=True)
+def empty_queue(database):
+    with database.begin() as conn:
+        conn.execute(text("TRUNCATE jobs RESTART IDENTITY"))
+
+def age_heartbeat(job_id: int, minutes: int) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            text("UPDATE jobs SET heartbeat_at = now() - make_interval(mins => :m) WHERE id = :id"),
+            {"m": minutes, "id": job_id},
+        )
+        db.commit()
+
+def get_job(job_id: int) -> Job:
+    with SessionLocal() as db:
+        return db.get(Job, job_id)
+
+def test_enqueue_keeps_one_active_job_per_keyword():
+    first = enqueue(["tarım", " tarım ", "yoksulluk"])
+    assert [j.keyword for j in first] == ["tarım", "yoksulluk"]
+
+    again = enqueue(["tarım"])
+    assert again[0].id == first[0].id
+
+    finish_job(first[0].id, "done")
+    assert enqueue(["tarım"])[0].id != first[0].id
+
+def test_claim_job_hands_out_each_job_once():
+    enqueue(["a", "b"])
+    one, two = claim_job("w1"), claim_job("w2")
+    assert {one.keyword, two.keyword} == {"a", "b"}
+    assert (one.status, one.worker, one.attempts) == ("running", "w1", 1)
+    assert one.heartbeat_at is not None
+    assert claim_job("w3") is None
+
+def test_requeue_stale_follows_the_heartbeat_not_the_start_time():
+    job_id = enqueue(["long"])[0].id
+    claim_job("w1")
+    with SessionLocal() as db:
+        db.execute(text("UPDATE jobs SET started_at = now() - interval '1 day' WHERE id = :id"), {"id": job_id})
+        db.commit()
+
+    # Running for a day, but still heartbeating
+    assert heartbeat(job_id, "w1")
+    assert requeue_stale(minutes=5) == 0
+
+    age_heartbeat(job_id, 10)
+    assert requeue_stale(minutes=5) == 1
+    job = get_job(job_id)
+    assert (job.status, job.worker) == ("queued", None)
+
+def test_worker_that_lost_its_lease_cannot_finish_the_job():
+    job_id = enqueue(["k"])[0].id
+    claim_job("w1")
+    age_heartbeat(job_id, 10)
+    requeue_stale(minutes=5)
+    claim_job("w2")
+
+    assert not heartbeat(job_id, "w1")
+    finish_job(job_id, "failed", error="late", worker="w1")
+    job = get_job(job_id)
+    assert (job.status, job.worker, job.attempts) == ("running", "w2", 2)
+
+    finish_job(job_id, "done", worker="w2")
+    assert get_job(job_id).status == "done"
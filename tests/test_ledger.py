@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+from src.tuik_pipeline.etl.ledger import is_fresh, params_json
+from src.tuik_pipeline.models.artifact import Artifact
+
+PARAMS = {"header_rows": [3]}
+
+def artifact(tmp_path, **overrides) -> Artifact:
+    out = tmp_path / "out.csv"
+    out.write_text("x", encoding="utf-8")
+    fields = dict(
+        stage="normalize",
+        input_path="in.xls",
+        input_sha256="abc",
+        code_version="1",
+        params=params_json(PARAMS),
+        output_paths=json.dumps([str(out)]),
+        status="normalized",
+    )
+    fields.update(overrides)
+    return Artifact(**fields)
+
+def test_unchanged_input_is_fresh(tmp_path):
+    assert is_fresh(artifact(tmp_path), "abc", "1", PARAMS, "normalized")
+
+def test_missing_row_is_not_fresh():
+    assert not is_fresh(None, "abc", "1", PARAMS, "normalized")
+
+def test_any_change_makes_it_stale(tmp_path):
+    row = artifact(tmp_path)
+    assert not is_fresh(row, "def", "1", PARAMS, "normalized")
+    assert not is_fresh(row, "abc", "2", PARAMS, "normalized")
+    assert not is_fresh(row, "abc", "1", {"header_rows": [4]}, "normalized")
+    assert not is_fresh(artifact(tmp_path, status="failed"), "abc", "1", PARAMS, "normalized")
+
+def test_params_order_does_not_matter(tmp_path):
+    params = {"a": 1, "b": 2}
+    row = artifact(tmp_path, params=params_json(params))
+    assert is_fresh(row, "abc", "1", {"b": 2, "a": 1}, "normalized")
+
+def test_deleted_output_is_not_fresh(tmp_path):
+    row = artifact(tmp_path)
+    for p in json.loads(row.output_paths):
+        Path(p).unlink()
+    assert not is_fresh(row, "abc", "1", PARAMS, "normalized")
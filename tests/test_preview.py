@@ -0,0 +1,89 @@
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from src.tuik_pipeline.api import preview
+from src.tuik_pipeline.api.preview import UnknownColumnsError, read_window
+
+ROWS = 10
+
+@pytest.fixture(scope="module")
+def workbook() -> bytes:
+    # Three title rows, then the header, like a TUIK sheet
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Tablo 1"])
+    ws.append(["Birim: Kişi"])
+    ws.append([None])
+    ws.append(["Yıl", "Erkek", "Kadın"])
+    for i in range(ROWS):
+        ws.append([2000 + i, 100 + i, 200 + i])
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+def test_whole_sheet(workbook):
+    df, has_more = read_window(workbook)
+    assert list(df.columns) == ["Yıl", "Erkek", "Kadın"]
+    assert df["Yıl"].tolist() == list(range(2000, 2000 + ROWS))
+    assert not has_more
+
+def test_window_and_has_more(workbook):
+    df, has_more = read_window(workbook, offset=3, limit=4)
+    assert df["Yıl"].tolist() == [2003, 2004, 2005, 2006]
+    assert has_more
+
+    df, has_more = read_window(workbook, offset=6, limit=4)
+    assert df["Yıl"].tolist() == [2006, 2007, 2008, 2009]
+    assert not has_more
+
+def test_columns_in_requested_order(workbook):
+    df, _ = read_window(workbook, limit=2, columns=["Kadın", "Yıl"])
+    assert list(df.columns) == ["Kadın", "Yıl"]
+    assert df.values.tolist() == [[200, 2000], [201, 2001]]
+
+def test_unknown_columns(workbook):
+    with pytest.raises(UnknownColumnsError) as e:
+        read_window(workbook, columns=["Yıl", "Toplam"])
+    assert e.value.missing == ["Toplam"]
+    assert str(e.value) == "Unknown columns: Toplam"
+
+XLS = Path(__file__).resolve().parent.parent / "downloads" / "sosyoekonomik" / "2023"
+
+@pytest.fixture
+def xls_workbook() -> bytes:
+    found = sorted(XLS.glob("*.xls"))
+    if not found:
+        pytest.skip("no sample .xls workbook")
+    return found[0].read_bytes()
+
+def test_xls_sheet_parsed_once_and_windows_sliced(xls_workbook, monkeypatch):
+    monkeypatch.setattr(preview, "cache", preview.ByteCache(64 * 1024 * 1024))
+    full, _ = read_window(xls_workbook)
+
+    parses = []
+    parse = pd.ExcelFile.parse
+    monkeypatch.setattr(pd.ExcelFile, "parse", lambda self, *a, **kw: parses.append(a) or parse(self, *a, **kw))
+
+    first, has_more = read_window(xls_workbook, offset=5, limit=10, cache_key="k")
+    assert has_more
+    assert first.equals(full.iloc[5:15])
+
+    column = str(full.columns[0])
+    last, has_more = read_window(xls_workbook, offset=len(full) - 3, limit=10, columns=[column], cache_key="k")
+    assert not has_more
+    assert last[column].equals(full[column].iloc[-3:])
+    assert len(parses) == 1
+
+def test_byte_cache_evicts_sized_entries():
+    cache = preview.ByteCache(100)
+    cache.put("bytes", b"x" * 40)
+    cache.put("frame", object(), size=50)
+    cache.put("other", b"y" * 30)
+    assert cache.get("bytes") is None
+    assert cache.get("frame") is not None
+    cache.put("huge", object(), size=101)
+    assert cache.get("huge") is None
@@ -0,0 +1,26 @@
+import pstats
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from src.tuik_pipeline.core.profiling import profile_stage, profile_worker, worker_profile_dir
+
+def sum_of_squares(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+def busy_task(profile_dir: str | None) -> int:
+    with profile_worker(profile_dir):
+        return sum_of_squares(10_000)
+
+def test_worker_process_profiles_are_merged(tmp_path, capsys):
+    assert worker_profile_dir() is None
+
+    with profile_stage("unit", out_dir=tmp_path):
+        profile_dir = worker_profile_dir()
+        with ProcessPoolExecutor(max_workers=2, mp_context=get_context("spawn")) as pool:
+            assert [f.result() for f in [pool.submit(busy_task, profile_dir) for _ in range(3)]]
+
+    assert "worker_tasks_profiled=3" in capsys.readouterr().out
+    [prof] = tmp_path.glob("unit-*.prof")
+    functions = {func for _, _, func in pstats.Stats(str(prof)).stats}
+    assert "sum_of_squares" in functions
+    assert worker_profile_dir() is None
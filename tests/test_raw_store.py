@@ -0,0 +1,44 @@
+import csv
+import os
+
+import pytest
+from sqlalchemy import text
+
+from src.tuik_pipeline.core import raw_store
+
+@pytest.fixture(autouse=True)
+def empty_ledger(database):
+    with database.begin() as conn:
+        conn.execute(text("TRUNCATE artifacts, run_items, pipeline_runs RESTART IDENTITY CASCADE"))
+
+def stored_versions(directory, count):
+    directory.mkdir(parents=True)
+    files = []
+    for i in range(count):
+        p = directory / f"{i:064x}.xls"
+        p.write_bytes(b"x")
+        os.utime(p, (1000 + i, 1000 + i))
+        files.append(p)
+    return files  # oldest first
+
+def test_prune_keeps_referenced_versions_and_drops_ledger_rows(tmp_path, database):
+    root = tmp_path / "downloads"
+    files = stored_versions(raw_store.dataset_dir(5, root), 5)
+
+    (root / "kw").mkdir()
+    with open(root / "kw" / "manifest.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["dataset_id", "saved_path"])
+        writer.writeheader()
+        writer.writerow({"dataset_id": 5, "saved_path": str(files[0])})
+    with database.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO artifacts (stage, input_path, scope, input_sha256, code_version, params, output_paths, status) "
+            "VALUES ('normalize', :p, '', 'x', '1', '{}', '[]', 'normalized')"
+        ), {"p": str(files[1])})
+
+    removed = raw_store.prune(files[0].parent, keep=2)
+
+    assert sorted(removed) == sorted(files[1:3])
+    assert files[0].exists() and files[3].exists() and files[4].exists()
+    with database.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM artifacts")).scalar_one() == 0
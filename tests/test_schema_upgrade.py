@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.tuik_pipeline.core.database import Base
+
+SCHEMA = "baseline_upgrade"
+
+# What create_tables produced before observations were dictionary-encoded
+BASELINE_DDL = [
+    """CREATE TABLE categories (
+        id SERIAL PRIMARY KEY,
+        tuik_key VARCHAR(200) NOT NULL,
+        name VARCHAR(300) NOT NULL,
+        parent_id INTEGER REFERENCES categories (id),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+    )""",
+    "CREATE UNIQUE INDEX ix_categories_tuik_key ON categories (tuik_key)",
+    """CREATE TABLE datasets (
+        id SERIAL PRIMARY KEY,
+        ust_id INTEGER NOT NULL,
+        group_name VARCHAR(255),
+        title TEXT NOT NULL,
+        publish_date_raw VARCHAR(64),
+        download_path TEXT NOT NULL,
+        download_url TEXT NOT NULL,
+        is_archived BOOLEAN NOT NULL,
+        CONSTRAINT uq_datasets_ust_path_title UNIQUE (ust_id, download_path, title)
+    )""",
+    "CREATE INDEX ix_datasets_ust_id ON datasets (ust_id)",
+    """CREATE TABLE observations (
+        id BIGSERIAL PRIMARY KEY,
+        dataset_id INTEGER NOT NULL REFERENCES datasets (id) ON DELETE CASCADE,
+        year INTEGER,
+        threshold TEXT,
+        metric TEXT NOT NULL,
+        education TEXT,
+        value NUMERIC(18, 6),
+        source_file TEXT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+    )""",
+    "CREATE INDEX ix_observations_year ON observations (year)",
+    "CREATE INDEX ix_observations_metric ON observations (metric)",
+    "CREATE INDEX ix_obs_dataset_year ON observations (dataset_id, year)",
+    "CREATE INDEX ix_observations_dataset_id ON observations (dataset_id)",
+    "CREATE INDEX ix_observations_education ON observations (education)",
+]
+
+@pytest.fixture
+def baseline_engine(database):
+    """
+    An engine whose search_path is a fresh schema holding a baseline-shaped database.
+    """
+    with database.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    eng = create_engine(database.url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    with eng.begin() as conn:
+        for sql in BASELINE_DDL:
+            conn.execute(text(sql))
+        conn.execute(text(
+            "INSERT INTO datasets (id, ust_id, title, download_path, download_url, is_archived) "
+            "VALUES (1, 1, 't', '/t', 'http://t', false)"
+        ))
+        conn.execute(text(
+            "INSERT INTO observations (dataset_id, year, threshold, metric, education, value, source_file) "
+            "VALUES (1, 2020, '%50', 'oran', 'lise', 12.5, 'a.csv'), (1, 2021, NULL, 'oran', NULL, 13, 'a.csv')"
+        ))
+    yield eng
+    eng.dispose()
+    with database.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+def test_create_tables_migrates_a_baseline_database(baseline_engine):
+    Base.metadata.create_all(bind=baseline_engine)
+
+    with baseline_engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT year, threshold, metric, education, value, source_file FROM observations ORDER BY year"
+        )).all()
+        kind = conn.execute(text(
+            "SELECT table_type FROM information_schema.tables "
+            "WHERE table_schema = current_schema() AND table_name = 'observations'"
+        )).scalar_one()
+    assert kind == "VIEW"
+    assert [tuple(r) for r in rows] == [
+        (2020, "%50", "oran", "lise", 12.5, "a.csv"),
+        (2021, None, "oran", None, 13, "a.csv"),
+    ]
+
+    # Running it again on the migrated schema is a no-op
+    Base.metadata.create_all(bind=baseline_engine)
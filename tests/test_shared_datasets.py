@@ -0,0 +1,88 @@
+import pytest
+from openpyxl import Workbook
+from sqlalchemy import text
+
+from src.tuik_pipeline.etl.loader import run_loader_pipeline
+from src.tuik_pipeline.etl.normalizer import run_normalization_pipeline
+
+DATASET_ID = 501
+
+@pytest.fixture
+def shared_workbook(database, tmp_path, monkeypatch):
+    """
+    One stored workbook listed in the download manifests of two keywords.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("src.tuik_pipeline.core.arrow_store.settings.arrow_store_enabled", False)
+    with database.begin() as conn:
+        conn.execute(text("TRUNCATE artifacts, source_files, datasets RESTART IDENTITY CASCADE"))
+        conn.execute(text(
+            "INSERT INTO datasets (id, ust_id, title, download_path, download_url, is_archived) "
+            "VALUES (:id, 1, 'B', '/b', 'http://b', false)"
+        ), {"id": DATASET_ID})
+
+    stored = tmp_path / "downloads" / "_store" / str(DATASET_ID) / "B.xlsx"
+    stored.parent.mkdir(parents=True)
+    wb = Workbook()
+    wb.active.append(["Yıl", "Erkek", "Kadın"])
+    for i in range(5):
+        wb.active.append([2000 + i, i, 2 * i])
+    wb.save(stored)
+
+    manifests = []
+    for kw in ("a", "b"):
+        manifest = tmp_path / "downloads" / kw / "manifest.csv"
+        manifest.parent.mkdir(parents=True)
+        manifest.write_text(
+            "dataset_id,keyword,group_name,title,download_url,saved_path,run_id\n"
+            f"{DATASET_ID},{kw},G,B,http://b,downloads/_store/{DATASET_ID}/B.xlsx,\n",
+            encoding="utf-8",
+        )
+        manifests.append(str(manifest.relative_to(tmp_path)))
+    return manifests
+
+def fact_rows(database) -> int:
+    with database.connect() as conn:
+        return conn.execute(
+            text("SELECT count(*) FROM observation_facts WHERE dataset_id = :id"), {"id": DATASET_ID}
+        ).scalar_one()
+
+def test_keywords_share_one_normalized_copy_and_load(shared_workbook, database, tmp_path):
+    for manifest in shared_workbook:
+        run_normalization_pipeline(manifest, header_rows=[0], workers=1)
+
+    csvs = sorted(p.relative_to(tmp_path).as_posix() for p in (tmp_path / "normalized").rglob("*.csv"))
+    assert csvs == ["normalized/_datasets/501/B.csv", "normalized/a/manifest.csv", "normalized/b/manifest.csv"]
+
+    run_loader_pipeline("normalized/a", replace=True)
+    loaded = fact_rows(database)
+    assert loaded == 10
+
+    # The second keyword neither duplicates nor wipes the shared rows
+    run_loader_pipeline("normalized/b")
+    run_loader_pipeline("normalized/b", replace=True)
+    assert fact_rows(database) == loaded
+
+def test_superseded_csvs_are_removed_with_their_rows(shared_workbook, database, tmp_path):
+    manifest = shared_workbook[0]
+    run_normalization_pipeline(manifest, header_rows=[0], workers=2)
+    run_loader_pipeline("normalized/a")
+    assert fact_rows(database) == 10
+
+    # The workbook gains sheets: '<title>.csv' gives way to one CSV per sheet
+    stored = tmp_path / "downloads" / "_store" / str(DATASET_ID) / "B.xlsx"
+    wb = Workbook()
+    wb.remove(wb.active)
+    for name in ("S1", "S2", "S3"):
+        ws = wb.create_sheet(name)
+        ws.append(["Yıl", "Erkek"])
+        for i in range(3):
+            ws.append([2000 + i, i])
+    wb.save(stored)
+
+    run_normalization_pipeline(manifest, header_rows=[0], workers=2)
+    names = sorted(p.name for p in (tmp_path / "normalized" / "_datasets" / str(DATASET_ID)).iterdir())
+    assert names == ["B__S1.csv", "B__S2.csv", "B__S3.csv"]
+
+    run_loader_pipeline("normalized/a")
+    assert fact_rows(database) == 9